@@ -8,5 +8,9 @@ quadratic equations with robust error checking and validation.
 from .equation_parser import parse_equation
 from .solver import solve, reduce_form, degree
 from .math_utils import sqrt, abs
+from .evaluation import evaluate, evaluate_derivative
+from .classify import classify, classify_batch
+from .errors import ParseError, LimitExceededError
 
-__all__ = ['parse_equation', 'solve', 'reduce_form', 'degree', 'sqrt', 'abs']
+__all__ = ['parse_equation', 'solve', 'reduce_form', 'degree', 'sqrt', 'abs',
+           'evaluate', 'evaluate_derivative', 'classify', 'classify_batch', 'ParseError', 'LimitExceededError']
@@ -0,0 +1,412 @@
+"""
+Batch solving module.
+Parses many equations, solves each distinct coefficient vector once and
+writes one JSON result row per input line.
+"""
+
+import json
+import os
+import sys
+import time
+from equation_parser import parse_equation
+from solver import solution_lines, solve_precision, reduce_form, degree
+from errors import ParseError
+
+SAMPLE_SIZE = 1000
+CHUNK_SIZE = 10000
+PROGRESS_ROWS = 1000
+CHECKPOINT_INTERVAL = 10.0
+MIN_DEDUPE_RATIO = 1.25
+
+"""Estimate rows per unique row from a leading sample of row keys."""
+def estimate_dedupe_ratio(keys):
+    if not keys:
+        return 1.0
+    return len(keys) / len(set(keys))
+
+"""Return a hashable key per coefficient row, for dictionaries or a coefficient matrix."""
+def row_keys(coefficients, limit=None):
+    rows = coefficients[:limit] if limit is not None else coefficients
+    if isinstance(coefficients, list):
+        return [tuple(sorted((p, c + 0.0) for p, c in coeffs.items() if c != 0)) for coeffs in rows]
+    return [tuple(row) for row in (rows + 0.0).tolist()]
+
+"""Group identical coefficient rows, returning (first index of each unique row, inverse index per row).
+
+Coefficient matrices go through np.unique; lists of dictionaries are grouped by hashing.
+"""
+def unique_rows(coefficients):
+    if not isinstance(coefficients, list):
+        import numpy as np
+
+        _, first, inverse = np.unique(coefficients + 0.0, axis=0, return_index=True, return_inverse=True)
+        return first.tolist(), inverse.reshape(-1).tolist()
+
+    seen = {}
+    first = []
+    inverse = []
+    for row, key in enumerate(row_keys(coefficients)):
+        if key not in seen:
+            seen[key] = len(first)
+            first.append(row)
+        inverse.append(seen[key])
+    return first, inverse
+
+"""Return the coefficient dictionary of one row (matrix rows are highest power first)."""
+def row_coefficients(coefficients, row):
+    if isinstance(coefficients, list):
+        return coefficients[row]
+    values = coefficients[row].tolist()
+    return {len(values) - 1 - k: c for k, c in enumerate(values) if c != 0}
+
+"""Return the error text recorded in the row of an equation that raised e."""
+def error_message(e):
+    return str(e) if isinstance(e, ParseError) else f"{type(e).__name__}: {e}"
+
+"""Solve one row, returning its solution lines or the exception it raised."""
+def solve_row(coefficients, row, polish, intervals):
+    try:
+        return solution_lines(row_coefficients(coefficients, row), polish, intervals)
+    except Exception as e:
+        return e
+
+"""Solve the given rows, recording per-row solve seconds in latencies when it is a dictionary.
+
+progress, when given, is called with the fraction of rows solved every PROGRESS_ROWS rows.
+"""
+def solve_rows(coefficients, rows, polish, intervals, latencies, progress=None):
+    if latencies is None and progress is None:
+        return [solve_row(coefficients, row, polish, intervals) for row in rows]
+    results = []
+    for row in rows:
+        start = time.perf_counter()
+        results.append(solve_row(coefficients, row, polish, intervals))
+        if latencies is not None:
+            latencies[row] = time.perf_counter() - start
+        if progress is not None and len(results) % PROGRESS_ROWS == 0:
+            progress(len(results) / len(rows))
+    return results
+
+"""Solve many polynomials, solving each distinct coefficient row only once.
+
+coefficients is a list of parse_equation dictionaries or a NumPy matrix with one
+polynomial per row, highest power first. dedupe is True, False or "auto"; in auto
+mode the dedupe step is skipped when a leading sample suggests fewer than
+MIN_DEDUPE_RATIO rows per unique row. Returns (solution lines per row, report); a row
+whose solve raised holds the exception instead of its lines.
+When a latencies dictionary is given, it receives the solve seconds of every row
+actually solved, keyed by row index. progress is passed on to solve_rows.
+"""
+def solve_batch(coefficients, polish=False, intervals=False, dedupe="auto", latencies=None, progress=None):
+    rows = len(coefficients)
+    report = {"rows": rows, "unique": rows, "dedupe_ratio": 1.0, "deduped": False,
+              "dedupe_seconds": 0.0, "solve_seconds": 0.0, "estimated_saved_seconds": 0.0}
+    if dedupe == "auto":
+        report["estimated_ratio"] = estimate_dedupe_ratio(row_keys(coefficients, SAMPLE_SIZE))
+        dedupe = report["estimated_ratio"] >= MIN_DEDUPE_RATIO
+
+    if not dedupe or not rows:
+        start = time.perf_counter()
+        results = solve_rows(coefficients, range(rows), polish, intervals, latencies, progress)
+        report["solve_seconds"] = time.perf_counter() - start
+        return results, report
+
+    start = time.perf_counter()
+    first, inverse = unique_rows(coefficients)
+    report["dedupe_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    unique_results = solve_rows(coefficients, first, polish, intervals, latencies, progress)
+    report["solve_seconds"] = time.perf_counter() - start
+
+    results = [unique_results[k] for k in inverse]
+    per_solve = report["solve_seconds"] / len(first)
+    report.update(unique=len(first), dedupe_ratio=rows / len(first), deduped=True,
+                  estimated_saved_seconds=(rows - len(first)) * per_solve - report["dedupe_seconds"])
+    return results, report
+
+"""Parse and solve one chunk of (line number, equation) entries, returning (rows, report).
+
+With a store, results already on disk are reused and new ones are written back.
+With metrics, per-stage and per-row latencies are recorded. progress, when given, is
+called every PROGRESS_ROWS rows with the fraction of the chunk done, parsing and solving
+counting for half each.
+"""
+def process_chunk(entries, polish=False, intervals=False, dedupe="auto", store=None, metrics=None,
+                  progress=None):
+    mode = ("polish" if polish else "") + ("intervals" if intervals else "")
+    start = time.perf_counter()
+    cached = store.get_many([equation for _, equation in entries], mode) if store else {}
+    if store is not None and metrics is not None:
+        metrics.record_stage("store_lookup", time.perf_counter() - start)
+
+    rows = []
+    parsed = []
+    row_seconds = []
+    for lineno, equation in entries:
+        row = {"line": lineno, "equation": equation}
+        timings = {} if metrics is not None else None
+        start = time.perf_counter()
+        if equation in cached:
+            row.update((k, v) for k, v in cached[equation].items() if k != "coeffs")
+        else:
+            try:
+                coeffs = parse_equation(equation, timings=timings)
+            except Exception as e:
+                row["error"] = error_message(e)
+            else:
+                parsed_at = time.perf_counter()
+                row["reduced"] = reduce_form(coeffs) + " = 0"
+                row["degree"] = degree(coeffs)
+                parsed.append((row, coeffs))
+                if metrics is not None:
+                    timings["parse"] = parsed_at - start
+                    timings["reduce"] = time.perf_counter() - parsed_at
+        rows.append(row)
+        if metrics is not None:
+            row_seconds.append(time.perf_counter() - start)
+            for stage, seconds in timings.items():
+                metrics.record_stage(stage, seconds)
+        if progress is not None and len(rows) % PROGRESS_ROWS == 0:
+            progress(len(rows) / len(entries) / 2)
+
+    latencies = {} if metrics is not None else None
+    solved = None if progress is None else lambda fraction: progress(0.5 + fraction / 2)
+    results, report = solve_batch([coeffs for _, coeffs in parsed], polish, intervals, dedupe, latencies, solved)
+    for (row, coeffs), lines in zip(parsed, results):
+        if isinstance(lines, Exception):
+            row["error"] = error_message(lines)
+            continue
+        row["solution"] = lines
+        row["precision"] = "interval" if intervals else solve_precision(coeffs)
+    report["errors"] = sum(1 for row in rows if "error" in row)
+    report["escalated"] = sum(1 for row in rows if row.get("precision") == "exact")
+    report["store_hits"] = sum(1 for _, equation in entries if equation in cached)
+
+    if metrics is not None:
+        solve_seconds = {id(parsed[k][0]): seconds for k, seconds in latencies.items()}
+        for seconds in latencies.values():
+            metrics.record_stage("solve", seconds)
+        for row, seconds in zip(rows, row_seconds):
+            metrics.record_row(row, seconds + solve_seconds.get(id(row), 0.0))
+
+    if store is not None:
+        start = time.perf_counter()
+        records = {}
+        coefficients = {id(row): coeffs for row, coeffs in parsed}
+        for row in rows:
+            if row["equation"] in cached:
+                continue
+            record = {k: v for k, v in row.items() if k not in ("line", "equation")}
+            if id(row) in coefficients:
+                record["coeffs"] = {str(p): c for p, c in coefficients[id(row)].items()}
+            records[row["equation"]] = record
+        store.put_many(records, mode)
+        if metrics is not None:
+            metrics.record_stage("store_write", time.perf_counter() - start)
+    return rows, report
+
+"""Yield (entries, end offset, last line number) chunks of (line number, equation) entries.
+
+stream is binary; blank lines are skipped. The end offset is the byte position just
+after the chunk, so a run can later resume from it.
+"""
+def read_chunks(stream, chunk_size, offset=0, lineno=0):
+    chunk = []
+    for raw in stream:
+        lineno += 1
+        offset += len(raw)
+        equation = raw.decode("utf-8").rstrip('\r\n')
+        if not equation.strip():
+            continue
+        chunk.append((lineno, equation))
+        if len(chunk) >= chunk_size:
+            yield chunk, offset, lineno
+            chunk = []
+    if chunk:
+        yield chunk, offset, lineno
+
+worker_state = {}
+
+"""Initialize a batch worker process with its own store connection and metrics setting."""
+def init_worker(store_path, with_metrics):
+    worker_state["store"] = None
+    if store_path is not None:
+        from store import ResultStore
+        worker_state["store"] = ResultStore(store_path)
+    worker_state["with_metrics"] = with_metrics
+
+"""Process one chunk inside a worker, returning (rows, report, metrics or None)."""
+def process_chunk_in_worker(entries, polish, intervals, dedupe, progress=None):
+    metrics = None
+    if worker_state["with_metrics"]:
+        from metrics import BatchMetrics
+        metrics = BatchMetrics()
+    rows, report = process_chunk(entries, polish, intervals, dedupe, worker_state["store"], metrics, progress)
+    return rows, report, metrics
+
+"""Yield (rows, report, metrics, end offset, last line number) per chunk, in input order.
+
+With several workers, chunks are solved in a process pool with a bounded number in flight.
+With one, progress(fraction, rows, end offset) is called from inside every chunk.
+"""
+def chunk_results(chunks, workers, polish, intervals, dedupe, store_path, with_metrics, progress=None):
+    if workers <= 1:
+        init_worker(store_path, with_metrics)
+        try:
+            for entries, offset, lineno in chunks:
+                inside = None
+                if progress is not None:
+                    inside = lambda fraction, rows=len(entries), end=offset: progress(fraction, rows, end)
+                yield process_chunk_in_worker(entries, polish, intervals, dedupe, inside) + (offset, lineno)
+        finally:
+            if worker_state["store"] is not None:
+                worker_state["store"].close()
+        return
+
+    import multiprocessing
+    from collections import deque
+
+    with multiprocessing.Pool(workers, init_worker, (store_path, with_metrics)) as pool:
+        pending = deque()
+        for entries, offset, lineno in chunks:
+            pending.append((pool.apply_async(process_chunk_in_worker, (entries, polish, intervals, dedupe)),
+                            offset, lineno))
+            if len(pending) >= workers * 2:
+                result, offset, lineno = pending.popleft()
+                yield result.get() + (offset, lineno)
+        while pending:
+            result, offset, lineno = pending.popleft()
+            yield result.get() + (offset, lineno)
+
+"""Read a checkpoint file, returning its state or None when there is none."""
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+"""Atomically replace the checkpoint file with the given state."""
+def save_checkpoint(path, state):
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+"""Return why a saved checkpoint cannot be resumed against the current files, or None."""
+def checkpoint_mismatch(saved, current, output_path):
+    if saved.get("input") != current["input"]:
+        return f"checkpoint belongs to {saved.get('input')}"
+    if (saved.get("input_size"), saved.get("input_mtime")) != (current["input_size"], current["input_mtime"]):
+        return f"{current['input']} changed since the checkpoint was written"
+    output_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+    if saved.get("output_offset", 0) > output_size:
+        return f"{output_path} is shorter than the checkpoint records"
+    return None
+
+"""Solve every equation of a file (one per line) and write one JSON row per equation.
+
+When writing to a regular file, a checkpoint recording the input byte offset and the output
+bytes flushed so far is saved every checkpoint_interval seconds; resume=True
+truncates the output back to the last checkpoint and continues from there. A fresh
+run removes any previous checkpoint first; resuming is refused when the input changed
+or the output is shorter than the checkpoint records.
+"""
+def run_batch(input_path, output_path=None, polish=False, intervals=False, dedupe="auto",
+              store_path=None, chunk_size=CHUNK_SIZE, progress_interval=None, metrics_path=None,
+              workers=1, resume=False, checkpoint_path=None, checkpoint_interval=CHECKPOINT_INTERVAL):
+    to_file = output_path not in (None, '-')
+    regular = to_file and (not os.path.exists(output_path) or os.path.isfile(output_path))
+    if checkpoint_path is None and regular:
+        checkpoint_path = output_path + ".checkpoint"
+    if resume and (not regular or input_path == '-'):
+        print("Error: --resume needs an input file and a regular output file", file=sys.stderr)
+        return 1
+
+    state = {"input": os.path.abspath(input_path), "input_size": None, "input_mtime": None,
+             "input_offset": 0, "line": 0, "output_offset": 0, "rows": 0}
+    if input_path != '-':
+        stat = os.stat(input_path)
+        state.update(input_size=stat.st_size, input_mtime=stat.st_mtime_ns)
+    if resume:
+        saved = load_checkpoint(checkpoint_path)
+        if saved is not None:
+            problem = checkpoint_mismatch(saved, state, output_path)
+            if problem is not None:
+                print(f"Error: cannot resume, {problem}", file=sys.stderr)
+                return 1
+            state = saved
+            print(f"Resuming after line {state['line']} ({state['rows']} rows already written)", file=sys.stderr)
+
+    elif regular and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    metrics = None
+    if progress_interval is not None or metrics_path is not None:
+        from metrics import BatchMetrics
+        total_bytes = None if input_path == '-' else os.path.getsize(input_path)
+        metrics = BatchMetrics(total_bytes, progress_interval, start_offset=state["input_offset"])
+
+    totals = {"rows": 0, "errors": 0, "unique": 0, "store_hits": 0, "escalated": 0, "estimated_saved_seconds": 0.0}
+    stream = sys.stdin.buffer if input_path == '-' else open(input_path, "rb")
+    if to_file:
+        out = open(output_path, "r+b" if resume and os.path.exists(output_path) else "wb")
+        if regular:
+            out.truncate(state["output_offset"] if resume else 0)
+            out.seek(0, os.SEEK_END)
+    else:
+        out = sys.stdout.buffer
+    offset = state["input_offset"]
+    last_checkpoint = time.perf_counter()
+    try:
+        if offset:
+            stream.seek(offset)
+        chunks = read_chunks(stream, chunk_size, offset, state["line"])
+
+        def chunk_progress(fraction, rows, end):
+            metrics.progress(offset + (end - offset) * fraction, rows_in_flight=int(rows * fraction))
+
+        for rows, report, chunk_metrics, offset, lineno in chunk_results(
+                chunks, workers, polish, intervals, dedupe, store_path, metrics is not None,
+                chunk_progress if progress_interval is not None else None):
+            out.write("".join(json.dumps(row) + "\n" for row in rows).encode("utf-8"))
+            totals["rows"] += len(rows)
+            for key in ("errors", "unique", "store_hits", "escalated", "estimated_saved_seconds"):
+                totals[key] += report[key]
+            if metrics is not None:
+                metrics.merge(chunk_metrics)
+                metrics.progress(offset)
+            state.update(input_offset=offset, line=lineno, rows=state["rows"] + len(rows))
+            if regular and time.perf_counter() - last_checkpoint >= checkpoint_interval:
+                checkpoint(out, checkpoint_path, state)
+                last_checkpoint = time.perf_counter()
+        if regular:
+            checkpoint(out, checkpoint_path, state)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+
+    if metrics is not None:
+        metrics.progress(offset, force=True)
+        if metrics_path is not None:
+            metrics.write(metrics_path)
+
+    escalation_rate = totals["escalated"] / max(totals["rows"] - totals["errors"], 1)
+    print(f"Batch: {totals['rows']} equations, {totals['errors']} errors, {totals['store_hits']} from store, "
+          f"{totals['escalated']} escalated to exact precision ({escalation_rate:.1%}), "
+          f"{totals['unique']} unique polynomials solved "
+          f"(~{totals['estimated_saved_seconds'] * 1000:.1f} ms saved by dedupe)", file=sys.stderr)
+    return 0
+
+"""Flush and fsync the output, then record the consistent state in the checkpoint."""
+def checkpoint(out, path, state):
+    out.flush()
+    os.fsync(out.fileno())
+    state["output_offset"] = out.tell()
+    save_checkpoint(path, state)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Shared-memory solve benchmark.
+
+Usage: python3 bench_shared.py [workers] [rows ...]
+Solves random quadratic coefficient matrices in one process, in a pool that pickles
+coefficient and root blocks, and in a pool that shares them through shared memory,
+and reports seconds and rows per second for each. Rows default to 10^6 and 10^7;
+10^8 rows needs about 6 GB of memory.
+"""
+
+import os
+import sys
+import time
+from multiprocessing import Pool
+from shared_solve import solve_block, solve_pickled, solve_shared
+
+"""Return the best of three timings of fn()."""
+def best_time(fn):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    import numpy as np
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 4)
+    sizes = [int(float(arg)) for arg in sys.argv[2:]] or [10**6, 10**7]
+
+    print(f"{workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'rows':>12} {'mode':>8} {'seconds':>9} {'rows/s':>12}")
+    generator = np.random.default_rng(42)
+    with Pool(workers) as pool:
+        for rows in sizes:
+            coefficients = generator.uniform(-10, 10, (rows, 3))
+            modes = [
+                ("single", lambda: solve_block(coefficients, np.empty((rows, 2), dtype=np.complex128))),
+                ("pickle", lambda: solve_pickled(coefficients, workers, pool)),
+                ("shared", lambda: solve_shared(coefficients, workers, pool)),
+            ]
+            for mode, fn in modes:
+                elapsed = best_time(fn)
+                print(f"{rows:>12} {mode:>8} {elapsed:>9.3f} {rows / elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    main()
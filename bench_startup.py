@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for solving a single equation from the command line.
+
+Usage: python3 bench_startup.py [budget_ms] [runs]
+Times fresh `python3 computor.py "equation"` processes against a bare interpreter,
+lists the slowest imports reported by -X importtime and exits with status 1 when
+the median overhead exceeds the budget or a module reserved for other modes
+(batch, daemon, store, NumPy paths) is imported.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+EQUATION = "5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0"
+DEFAULT_BUDGET_MS = 30.0
+DEFAULT_RUNS = 20
+HEAVY_MODULES = {"numpy", "scipy", "sqlite3", "json", "multiprocessing", "socket", "decimal",
+                 "fractions", "polish", "intervals", "batch", "store", "daemon", "cache"}
+
+"""Return the environment of the timed processes, with bytecode caching enabled as in a real install."""
+def bench_env():
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+"""Return the median wall time of running command, in milliseconds."""
+def median_ms(command, runs, env):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env, check=False)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+"""Return (module, self us, cumulative us) for every import of the single-equation path."""
+def import_times(env):
+    result = subprocess.run([sys.executable, "-X", "importtime", "computor.py", EQUATION],
+                            capture_output=True, text=True, env=env)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(own), int(cumulative)))
+    return imports
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RUNS
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    env = bench_env()
+    median_ms([sys.executable, "computor.py", EQUATION], 1, env)
+
+    baseline = median_ms([sys.executable, "-c", "pass"], runs, env)
+    startup = median_ms([sys.executable, "computor.py", EQUATION], runs, env)
+    overhead = startup - baseline
+    imports = import_times(env)
+
+    print(f"interpreter {baseline:.1f} ms, single equation {startup:.1f} ms, overhead {overhead:.1f} ms "
+          f"(budget {budget:.1f} ms, median of {runs})")
+    print("slowest imports (self us, cumulative us):")
+    for name, own, cumulative in sorted(imports, key=lambda item: -item[1])[:10]:
+        print(f"{own:>10} {cumulative:>10}  {name}")
+
+    heavy = sorted({name.split(".")[0] for name, _, _ in imports} & HEAVY_MODULES)
+    failed = False
+    if heavy:
+        print(f"FAIL: single-equation path imports {', '.join(heavy)}")
+        failed = True
+    if overhead > budget:
+        print(f"FAIL: startup overhead {overhead:.1f} ms exceeds budget {budget:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
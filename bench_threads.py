@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Thread scaling benchmark for the parse and solve core.
+
+Usage: python3 bench_threads.py [max_threads] [equations_per_thread]
+Runs parse_equation + solution_lines from 1 to max_threads threads and reports
+throughput and speedup. On a free-threaded build (python3.13t) the speedup should
+grow with the thread count; with the GIL it stays close to 1.
+"""
+
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+from equation_parser import parse_equation
+from solver import solution_lines
+from errors import ParseError
+
+EQUATIONS = [
+    "5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0",
+    "x^2 - 5*x + 6 = 0",
+    "(x+1)*(x-2) = 3",
+    "2*(X+1) = 6",
+    "x^(2*1) + x^(3-2) + x^(1*0) = 6",
+    "0.5 * X^2 -- 0.5 * X^1 = 0",
+    "x^3 = 8",
+]
+
+"""Parse and solve a slice of the workload, returning the number of equations handled."""
+def work(count):
+    for i in range(count):
+        equation = EQUATIONS[i % len(EQUATIONS)]
+        try:
+            solution_lines(parse_equation(equation))
+        except ParseError:
+            pass
+    return count
+
+"""Return a short description of the interpreter's GIL status."""
+def gil_status():
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return "GIL build"
+    enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    return "free-threaded build, GIL " + ("enabled" if enabled else "disabled")
+
+def main():
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 4)
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    print(f"Python {sys.version.split()[0]} ({gil_status()}), {per_thread} equations per thread")
+    print(f"{'threads':>8} {'eq/s':>12} {'speedup':>8}")
+    baseline = None
+    threads = 1
+    while threads <= max_threads:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            total = sum(pool.map(work, [per_thread] * threads))
+            elapsed = time.perf_counter() - start
+        rate = total / elapsed
+        baseline = baseline or rate
+        print(f"{threads:>8} {rate:>12.0f} {rate / baseline:>8.2f}")
+        threads *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Solve-result cache module.
+Shares solutions between equations that reduce to the same polynomial up to scaling.
+"""
+
+import threading
+from collections import OrderedDict
+
+from solver import degree, solution_lines, solve_precision
+
+DEFAULT_MAXSIZE = 4096
+
+"""Normalize coefficients by the leading one, clearing near-zeros like degree() does."""
+def normalize(coeffs):
+    deg = degree(coeffs)
+    lead = coeffs.get(deg, 0)
+    if abs(lead) <= 1e-12:
+        return {}
+    return {p: c / lead for p, c in coeffs.items() if abs(c) > 1e-12}
+
+"""Return the hashable canonical key of a normalized coefficient dictionary, exact to the bit."""
+def canonical_key(normalized):
+    deg = max(normalized, default=0)
+    return tuple(normalized.get(p, 0.0) + 0.0 for p in range(deg + 1))
+
+"""Bounded, thread-safe LRU cache of solution lines keyed on canonical coefficients.
+
+Interval enclosures and quadratics whose discriminant sign is decided exactly depend on
+the original coefficients, so they bypass the cache and are solved directly.
+"""
+class SolveCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def solution_lines(self, coeffs, polish=False, intervals=False):
+        normalized = normalize(coeffs)
+        if intervals or "exact" in (solve_precision(coeffs), solve_precision(normalized)):
+            with self._lock:
+                self.bypassed += 1
+            return solution_lines(coeffs, polish, intervals)
+        key = (canonical_key(normalized), polish, intervals)
+        with self._lock:
+            lines = self._entries.get(key)
+            if lines is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(lines)
+            self.misses += 1
+
+        lines = tuple(solution_lines(normalized or coeffs, polish, intervals))
+
+        with self._lock:
+            self._entries[key] = lines
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return list(lines)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.bypassed = 0
@@ -0,0 +1,284 @@
+"""
+Equation validation module.
+Scans equations once and collects every diagnostic, then confirms clean equations with the parser.
+"""
+
+import re
+import sys
+from collections import namedtuple
+from parser import parse_power_expression, split_term_spans, split_factor_spans
+from product_parser import VARIABLE, expand_products, needs_expansion, split_group
+from limits import DEFAULT_LIMITS
+from equation_parser import parse_equation
+from errors import ParseError, LimitExceededError
+
+Diagnostic = namedtuple("Diagnostic", ["code", "position", "message"])
+
+ALLOWED = set("0123456789.Xx+-*/^() ")
+
+"""Scan an integer or decimal literal starting at i, returning (end, text)."""
+def scan_number(equation, i):
+    start = i
+    while i < len(equation) and (equation[i].isdigit() or equation[i] == '.'):
+        i += 1
+    return i, equation[start:i]
+
+"""Return the index of the parenthesis closing the one at i, or None."""
+def matching_paren(equation, i, end):
+    depth = 0
+    for j in range(i, end):
+        if equation[j] == '(':
+            depth += 1
+        elif equation[j] == ')':
+            depth -= 1
+            if depth == 0:
+                return j
+    return None
+
+"""Return the degree of a factor without groups: its X power, or 0 without X."""
+def factor_degree(factor):
+    match = re.search(r'[Xx]\^\(?([0-9]+)', factor)
+    if match:
+        return int(match.group(1))
+    return len(VARIABLE.findall(factor))
+
+"""Return (degree, complex_group) of a space-free term holding groups, as product expansion sees it.
+
+Group degrees are multiplied by their power. complex_group is True when the term is left
+to distributive expansion and multiplies a group holding a product or power of X, which
+the parser rejects. Raises ValueError for group powers the parser refuses.
+"""
+def group_term_degree(text, start, end):
+    degree = 0
+    complex_group = False
+    factors = split_factor_spans(text, start, end)
+    expanded = needs_expansion(text, start, end)
+    for factor_start, factor_end in factors:
+        group = split_group(text, factor_start, factor_end)
+        if group is None:
+            degree += factor_degree(text[factor_start:factor_end])
+            continue
+        inner_start, inner_end, power_start = group
+        inner = max((group_term_degree(text, term_start, term_end)[0]
+                     for term_start, term_end, _ in split_term_spans(text, inner_start, inner_end)), default=0)
+        power = 1 if power_start is None else parse_power_expression(text[power_start:factor_end])
+        if power < 0:
+            raise ValueError("Negative powers of groups not supported")
+        degree += inner * power
+        if (not expanded and len(factors) > 1 and VARIABLE.search(text, inner_start, inner_end)
+                and re.search(r'[*/^]', text[inner_start:inner_end])):
+            complex_group = True
+    return degree, complex_group
+
+"""Check one side of an equation, appending diagnostics with positions relative to the whole equation."""
+def check_side(equation, start, end, diagnostics, limits):
+    report = lambda code, pos, message: diagnostics.append(Diagnostic(code, pos, message))
+
+    if not equation[start:end].strip():
+        report("E003", start, "Empty side of equation")
+        return
+
+    prev = None
+    sign_run = 0
+    open_parens = []
+    exponent_seen = False
+    denominator = None
+    term_start = start
+    term_degree = 0
+    term_has_group = False
+
+    def close_term(term_end):
+        if any(d.position >= term_start for d in diagnostics):
+            return
+        degree = term_degree
+        if term_has_group:
+            text = equation[term_start:term_end].replace(' ', '')
+            if re.search(r'\)/|/\(', text):
+                report("E036", term_start, "Division of parenthesized groups not supported")
+                return
+            try:
+                degree, complex_group = group_term_degree(text, 0, len(text))
+            except (ValueError, ZeroDivisionError) as e:
+                report("E032", term_start, str(e))
+                return
+            if complex_group:
+                report("E035", term_start, "Complex expressions in parentheses not supported")
+        if degree > limits.max_degree and term_has_group:
+            try:
+                expand_products(text, limits)
+            except ParseError as e:
+                report("E032", term_start, str(e))
+        elif degree > limits.max_degree:
+            report("E032", term_start, f"Invalid power: {degree}")
+
+    i = start
+    while i < end:
+        char = equation[i]
+        if char == ' ':
+            i += 1
+            continue
+        if char not in ALLOWED:
+            report("E010", i, f"Invalid character {char!r}")
+            prev = 'num'
+            i += 1
+            continue
+
+        if char in '+-':
+            sign_run = sign_run + 1 if prev == 'sign' else 1
+            if sign_run == 3:
+                report("E020", i, "Consecutive operators")
+            elif prev in ('mul', 'pow'):
+                report("E020", i, "Consecutive operators")
+            if not open_parens and prev not in ('sign', 'mul', 'pow', None):
+                close_term(i)
+                exponent_seen = False
+                denominator = None
+                term_start = i
+                term_degree = 0
+                term_has_group = False
+            prev = 'sign'
+        elif char in '*/':
+            if prev in ('sign', 'mul', 'pow', 'open') or (prev is None and char == '/'):
+                report("E020", i, "Consecutive operators")
+            if char == '/':
+                denominator = len(open_parens)
+                j = i + 1
+                while j < end and equation[j] == ' ':
+                    j += 1
+                k, text = scan_number(equation, j)
+                if text and text.count('.') <= 1 and text != '.' and float(text) == 0:
+                    report("E034", j, "Division by zero")
+            prev = 'mul'
+        elif char == '^':
+            if prev in (None, 'sign', 'mul', 'pow', 'open'):
+                report("E020", i, "Consecutive operators")
+            elif exponent_seen and prev == 'num' and not open_parens:
+                report("E033", i, "Multiple exponentiation operators")
+            j = i + 1
+            while j < end and equation[j] == ' ':
+                j += 1
+            if j >= end or equation[j] in ')+-*/^':
+                if j >= end or equation[j] == ')':
+                    report("E022", i, "Empty power")
+            elif equation[j] in 'Xx':
+                report("E031", j, "Variables in exponents not allowed")
+            elif equation[j].isdigit() or equation[j] == '.':
+                k, text = scan_number(equation, j)
+                if text.count('.') > 1 or text == '.':
+                    report("E013", j, f"Invalid number {text!r}")
+                elif '.' in text and float(text) != int(float(text)):
+                    report("E032", j, f"Power must be an integer: {text}")
+                elif prev == 'var':
+                    if int(float(text)) > 2:
+                        report("E032", j, f"Invalid power: {int(float(text))}")
+                    term_degree += int(float(text)) - 1
+                elif int(float(text)) > limits.max_exponent:
+                    report("E040", j, f"Limit exceeded: exponent {int(float(text))} > {limits.max_exponent}")
+                exponent_seen = True
+                prev = 'num'
+                i = k
+                continue
+            elif equation[j] == '(':
+                k = matching_paren(equation, j, end)
+                inner = equation[j + 1:k] if k is not None else ""
+                if VARIABLE.search(inner):
+                    report("E031", j, "Variables in exponents not allowed")
+                elif prev in ('var', 'num') and '**' not in inner and re.match(r'^[0-9+\-*/.\s()]+$', inner):
+                    try:
+                        power = parse_power_expression(inner)
+                    except (ValueError, ZeroDivisionError) as e:
+                        report("E032", j, str(e))
+                    else:
+                        if prev == 'num':
+                            if abs(power) > limits.max_exponent:
+                                report("E040", j, f"Limit exceeded: exponent {power} > {limits.max_exponent}")
+                        elif power not in (0, 1, 2):
+                            report("E032", j, f"Invalid power: {power}")
+                        else:
+                            term_degree += power - 1
+            exponent_seen = True
+            prev = 'pow'
+        elif char == '(':
+            open_parens.append(i)
+            if prev != 'pow':
+                term_has_group = True
+            prev = 'open'
+        elif char == ')':
+            if not open_parens:
+                report("E011", i, "Unmatched closing parenthesis")
+            else:
+                open_parens.pop()
+                if prev == 'open':
+                    report("E014", i, "Empty parentheses")
+            if denominator is not None and len(open_parens) < denominator:
+                denominator = None
+            prev = 'close'
+        elif char in 'Xx':
+            if denominator is not None:
+                report("E030", i, "Variables in denominators not supported")
+            if not open_parens:
+                term_degree += 1
+            prev = 'var'
+        else:
+            k, text = scan_number(equation, i)
+            if text.count('.') > 1 or text == '.':
+                report("E013", i, f"Invalid number {text!r}")
+            prev = 'num'
+            i = k
+            continue
+        i += 1
+
+    close_term(end)
+    if prev in ('sign', 'mul', 'pow'):
+        report("E021", end - 1, "Trailing operator")
+    for pos in open_parens:
+        report("E012", pos, "Unmatched opening parenthesis")
+
+"""Return every diagnostic for one equation, ordered by position.
+
+An equation the scan finds no problem in is also run through the parser, whose
+rejection is reported at position 0 (E040 for limits, E050 otherwise), so an equation
+is only valid here when the solver accepts it.
+"""
+def check_equation(equation, limits=DEFAULT_LIMITS):
+    diagnostics = []
+    if len(equation) > limits.max_length:
+        return [Diagnostic("E040", limits.max_length, f"Limit exceeded: input length {len(equation)} > {limits.max_length}")]
+
+    equals = [i for i, char in enumerate(equation) if char == '=']
+    if not equals:
+        diagnostics.append(Diagnostic("E001", len(equation), "Missing '=' sign"))
+        check_side(equation, 0, len(equation), diagnostics, limits)
+    else:
+        for pos in equals[1:]:
+            diagnostics.append(Diagnostic("E002", pos, "Multiple '=' signs"))
+        bounds = [-1] + equals + [len(equation)]
+        for k in range(len(bounds) - 1):
+            check_side(equation, bounds[k] + 1, bounds[k + 1], diagnostics, limits)
+    if not diagnostics:
+        try:
+            parse_equation(equation, limits)
+        except LimitExceededError as e:
+            diagnostics.append(Diagnostic("E040", 0, str(e)))
+        except ParseError as e:
+            diagnostics.append(Diagnostic("E050", 0, str(e)))
+    return sorted(diagnostics, key=lambda d: d.position)
+
+"""Check every line of a file and print a compact report, returning the number of invalid equations."""
+def check_file(path, out=sys.stdout, limits=DEFAULT_LIMITS):
+    checked = invalid = total = 0
+    stream = sys.stdin if path == '-' else open(path, encoding="utf-8")
+    with stream:
+        for lineno, line in enumerate(stream, 1):
+            equation = line.rstrip('\n')
+            if not equation.strip():
+                continue
+            checked += 1
+            diagnostics = check_equation(equation, limits)
+            if diagnostics:
+                invalid += 1
+                total += len(diagnostics)
+                for d in diagnostics:
+                    out.write(f"{lineno}:{d.position}: {d.code} {d.message}\n")
+    out.write(f"Checked {checked} equations: {checked - invalid} valid, {invalid} invalid, {total} diagnostics\n")
+    return invalid
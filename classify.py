@@ -0,0 +1,80 @@
+"""
+Classification module.
+Counts real solutions from the degree and the discriminant sign, without computing roots.
+"""
+
+from collections import namedtuple
+from solver import decimal_value, degree, float_discriminant
+
+INFINITE = -1
+UNSUPPORTED = -2
+SOLUTION_NAMES = {0: "none", 1: "one", 2: "two", INFINITE: "infinitely many", UNSUPPORTED: "unknown"}
+
+"""Degree, discriminant sign (None unless quadratic) and number of real solutions of an equation."""
+Classification = namedtuple("Classification", ["degree", "discriminant_sign", "solutions"])
+
+"""Return the exact sign of b*b - 4*a*c for coefficients at their decimal_value."""
+def exact_discriminant_sign(a, b, c):
+    A, B, C = (decimal_value(x) for x in (a, b, c))
+    D = B*B - 4*A*C
+    return (D > 0) - (D < 0)
+
+"""Return the sign of b*b - 4*a*c, deciding in float when its rounding error allows and exactly otherwise."""
+def discriminant_sign(a, b, c):
+    D, trusted = float_discriminant(a, b, c)
+    if trusted:
+        return 1 if D > 0 else -1
+    return exact_discriminant_sign(a, b, c)
+
+"""Classify a parse_equation dictionary without any square root or division."""
+def classify(coeffs):
+    deg = degree(coeffs)
+    if deg == 0:
+        return Classification(0, None, INFINITE if abs(coeffs.get(0, 0)) < 1e-12 else 0)
+    if deg == 1:
+        return Classification(1, None, 1)
+    if deg > 2:
+        return Classification(deg, None, UNSUPPORTED)
+    sign = discriminant_sign(coeffs.get(2, 0), coeffs.get(1, 0), coeffs.get(0, 0))
+    return Classification(2, sign, 1 + sign)
+
+"""Return output lines describing a classification."""
+def classification_lines(classification):
+    lines = []
+    if classification.discriminant_sign is not None:
+        name = {1: "positive", 0: "zero", -1: "negative"}[classification.discriminant_sign]
+        lines.append(f"Discriminant sign: {name}")
+    lines.append(f"Real solutions: {SOLUTION_NAMES[classification.solutions]}")
+    return lines
+
+"""Classify a coefficient matrix (one polynomial per row, highest power first) at once.
+
+Returns (degrees, signs, solutions) integer arrays; signs are 0 for rows that are not
+quadratic, and solutions uses INFINITE and UNSUPPORTED as in classify. Only rows
+whose float discriminant sign cannot be trusted are decided exactly, one by one.
+"""
+def classify_batch(matrix):
+    import numpy as np
+
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2:
+        raise ValueError("Coefficients must be a 2-D matrix")
+    rows, columns = matrix.shape
+    nonzero = np.abs(matrix) > 1e-12
+    degrees = np.where(nonzero.any(axis=1), columns - 1 - nonzero.argmax(axis=1), 0)
+
+    padded = np.zeros((rows, 3))
+    width = min(columns, 3)
+    padded[:, 3 - width:] = matrix[:, columns - width:]
+    a, b, c = padded[:, 0], padded[:, 1], padded[:, 2]
+    with np.errstate(over="ignore", invalid="ignore", under="ignore"):
+        D, trusted = float_discriminant(a, b, c)
+    quadratic = degrees == 2
+    signs = np.where(quadratic, np.sign(np.where(trusted, D, 0)), 0).astype(np.int8)
+    for row in np.flatnonzero(quadratic & ~trusted):
+        signs[row] = exact_discriminant_sign(float(a[row]), float(b[row]), float(c[row]))
+
+    solutions = np.select(
+        [degrees == 2, degrees == 1, (degrees == 0) & ~nonzero[:, -1], degrees == 0],
+        [1 + signs, 1, INFINITE, 0], UNSUPPORTED).astype(np.int8)
+    return degrees, signs, solutions
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Thin client for the computor daemon.
+
+Usage: python3 client.py "equation"
+Sends the equation to a running daemon (python3 computor.py --daemon) and prints
+its output. Falls back to solving in-process when no daemon is reachable.
+"""
+
+import socket
+import sys
+from daemon_socket import socket_path, trusted_socket
+
+TIMEOUT = 30.0
+
+"""Send the equation to the daemon at path, returning (exit code, output) or None when it cannot answer."""
+def ask_daemon(path, equation):
+    if not trusted_socket(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(TIMEOUT)
+            conn.connect(path)
+            conn.sendall(equation.encode("utf-8"))
+            conn.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        code, _, output = b"".join(chunks).decode("utf-8").partition("\n")
+        return int(code), output
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+
+def main():
+    if len(sys.argv) == 2:
+        reply = ask_daemon(socket_path(), sys.argv[1])
+        if reply is not None:
+            code, output = reply
+            sys.stdout.write(output)
+            sys.exit(code)
+
+    import computor
+    computor.main()
+
+if __name__ == "__main__":
+    main()
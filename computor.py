@@ -2,27 +2,117 @@
 """
 Quadratic Equation Solver - Main Program
 
-Usage: python3 computor.py "equation"
+Usage: python3 computor.py [--polish | --intervals | --classify] "equation"
+       python3 computor.py --check FILE
+       python3 computor.py --system FILE
+       python3 computor.py --batch INPUT [OUTPUT] [--no-dedupe] [--store DB]
+                           [--progress SECONDS] [--metrics FILE] [--workers N] [--resume]
+       python3 computor.py --shard INPUT N [DIR]
+       python3 computor.py --merge INPUT OUTPUT RESULT...
+       python3 computor.py --daemon [workers]
 Example: python3 computor.py "5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0"
 """
 
 import sys
-from equation_parser import parse_equation
-from solver import solve, reduce_form, degree
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage format: ./computor \"equation\"")
-        sys.exit(1)
+"""Parse, reduce and solve (or only classify) one equation, printing the result and returning the exit status.
 
-    equation = sys.argv[1]
-    coeffs = parse_equation(equation)
+The parser and solver are imported on first call so that other modes, and usage
+errors, do not pay for them at startup.
+"""
+def run(equation, polish=False, intervals=False, cache=None, classify_only=False):
+    from equation_parser import parse_equation
+    from solver import solve, reduce_form, degree
+    from errors import ParseError
+
+    try:
+        coeffs = parse_equation(equation)
+    except ParseError as e:
+        print(f"Error: {e}")
+        return e.exit_code
 
     print("Reduced form:", reduce_form(coeffs), "= 0")
     deg = degree(coeffs)
     print("Polynomial degree:", deg)
 
-    solve(coeffs)
+    if classify_only:
+        from classify import classify, classification_lines
+        for line in classification_lines(classify(coeffs)):
+            print(line)
+        return 0
+
+    solve(coeffs, polish=polish, intervals=intervals, cache=cache)
+    return 0
+
+"""Import everything run() may need and build its patterns, e.g. before forking workers."""
+def preload():
+    import polish
+    import intervals
+    from equation_parser import parse_equation
+    from solver import solution_lines
+
+    for equation in ("(x + 1) * (x - 1) = 2 * x", "x^2 - 0.2 * x + 0.01 = 0"):
+        solution_lines(parse_equation(equation))
+
+"""Remove an option and its value from args, returning the value or None."""
+def pop_option(args, name):
+    if name not in args:
+        return None
+    index = args.index(name)
+    value = args[index + 1] if index + 1 < len(args) else None
+    del args[index:index + 2]
+    return value
+
+def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == "--daemon":
+        from daemon import serve
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        try:
+            serve(workers=workers)
+        except PermissionError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    if len(sys.argv) == 3 and sys.argv[1] == "--check":
+        from checker import check_file
+        invalid = check_file(sys.argv[2])
+        sys.exit(1 if invalid else 0)
+
+    if len(sys.argv) == 3 and sys.argv[1] == "--system":
+        from linear_system import solve_file
+        sys.exit(solve_file(sys.argv[2]))
+
+    if len(sys.argv) in (4, 5) and sys.argv[1] == "--shard":
+        from shard import split_input
+        sys.exit(split_input(sys.argv[2], int(sys.argv[3]), sys.argv[4] if len(sys.argv) == 5 else None))
+
+    if len(sys.argv) >= 5 and sys.argv[1] == "--merge":
+        from shard import merge_results
+        sys.exit(merge_results(sys.argv[2], sys.argv[4:], sys.argv[3]))
+
+    args = sys.argv[1:]
+    store_path = pop_option(args, "--store")
+    progress = pop_option(args, "--progress")
+    metrics_path = pop_option(args, "--metrics")
+    workers = pop_option(args, "--workers")
+    flags = {arg for arg in args if arg in ("--polish", "--intervals", "--classify", "--no-dedupe", "--resume")}
+    args = [arg for arg in args if arg not in flags]
+
+    if args and args[0] == "--batch" and len(args) in (2, 3):
+        from batch import run_batch
+        sys.exit(run_batch(args[1], args[2] if len(args) == 3 else None, 
+                           polish="--polish" in flags, intervals="--intervals" in flags, 
+                           dedupe=False if "--no-dedupe" in flags else "auto", store_path=store_path, 
+                           progress_interval=float(progress) if progress else None, metrics_path=metrics_path, 
+                           workers=int(workers) if workers else 1, resume="--resume" in flags))
+
+    if len(args) != 1:
+        print("Usage format: ./computor \"equation\"")
+        sys.exit(1)
+
+    sys.exit(run(args[0], polish="--polish" in flags, intervals="--intervals" in flags, 
+                 classify_only="--classify" in flags))
 
 if __name__ == "__main__":
     main()
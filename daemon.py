@@ -0,0 +1,107 @@
+"""
+Pre-forked worker pool serving equations over a local Unix socket.
+Workers import the parser and solver once, so each request only pays for the solve.
+"""
+
+import io
+import os
+import signal
+import socket
+import sys
+from contextlib import redirect_stdout
+
+import computor
+from daemon_socket import socket_path, trusted_socket
+
+DEFAULT_WORKERS = 4
+RECV_TIMEOUT = 5.0
+
+"""Run one equation the way computor.py would, returning (exit code, stdout text)."""
+def execute(equation):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        try:
+            code = computor.run(equation)
+        except Exception:
+            code = 1
+    return code, out.getvalue()
+
+"""Read one request from a client connection and send back its result.
+
+A client that stops sending for RECV_TIMEOUT seconds raises socket.timeout, freeing the worker.
+"""
+def handle(conn):
+    conn.settimeout(RECV_TIMEOUT)
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    equation = b"".join(chunks).decode("utf-8")
+    code, output = execute(equation)
+    conn.sendall(f"{code}\n{output}".encode("utf-8"))
+
+"""Accept connections forever in a forked worker."""
+def worker_loop(server):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    while True:
+        conn, _ = server.accept()
+        with conn:
+            try:
+                handle(conn)
+            except Exception:
+                pass
+
+"""Bind the socket, fork the workers and supervise them until terminated."""
+def serve(path=None, workers=None):
+    path = path or socket_path(create=True)
+    workers = workers or DEFAULT_WORKERS
+
+    computor.preload()
+    if os.path.lexists(path):
+        if not trusted_socket(path):
+            raise PermissionError(f"refusing to replace {path}: not a private socket of this user")
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(128)
+
+    children = set()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                worker_loop(server)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def shutdown(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for _ in range(workers):
+        spawn()
+    print(f"computor daemon listening on {path} with {workers} workers", file=sys.stderr)
+
+    while True:
+        pid, _ = os.wait()
+        children.discard(pid)
+        spawn()
@@ -0,0 +1,46 @@
+"""
+Daemon socket location module.
+Keeps the socket in a directory only the current user can enter, and checks its owner.
+"""
+
+import os
+import stat
+
+SOCKET_NAME = "computor.sock"
+
+"""Return the private socket directory: $XDG_RUNTIME_DIR, or a 0700 computor-<uid> directory in $TMPDIR."""
+def socket_directory():
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isabs(runtime):
+        return runtime
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"computor-{os.getuid()}")
+
+"""Return True when path exists, is not a symlink, belongs to the current user and is closed to others."""
+def owned_private(path, kind):
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return kind(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+"""Return the socket path shared by the daemon and its clients.
+
+$COMPUTOR_SOCKET wins when set. With create, the per-user directory is made with mode
+0700; an existing one that another user owns, or that others can enter, raises OSError.
+"""
+def socket_path(create=False):
+    if os.environ.get("COMPUTOR_SOCKET"):
+        return os.environ["COMPUTOR_SOCKET"]
+    directory = socket_directory()
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        if not owned_private(directory, stat.S_ISDIR):
+            raise PermissionError(f"unsafe socket directory {directory}")
+    return os.path.join(directory, SOCKET_NAME)
+
+"""Return True when path is a socket owned by the current user and closed to others."""
+def trusted_socket(path):
+    return owned_private(path, stat.S_ISSOCK)
@@ -4,30 +4,53 @@ Main parsing logic for polynomial equations.
 """
 
 import re
-import sys
-from parser import split_terms_with_parentheses, expand_distributive
+from time import perf_counter
+from parser import LazyPattern, split_term_spans, expand_distributive
 from term_parser import parse_term
+from product_parser import expand_products
+from limits import DEFAULT_LIMITS, check_equation, check_expanded
+from errors import ParseError
+
+INVALID_CHARACTERS = LazyPattern(r'[^0-9Xx\^\+\-\*/(). ]')
+VARIABLE_DENOMINATOR = LazyPattern(r'/[^()]*[Xx]', re.IGNORECASE)
+EMPTY_POWER = LazyPattern(r'\^[\+\-\*/(). ]*$')
+TRAILING_OPERATOR = LazyPattern(r'[+\-*^]$')
+
+"""Parse a polynomial equation into coefficient dictionary.
+
+When a timings dictionary is given, seconds spent per parsing stage are added to it.
+"""
+def parse_equation(equation, limits=None, timings=None):
+    if limits is None:
+        limits = DEFAULT_LIMITS
+    check_equation(equation, limits)
 
-"""Parse a polynomial equation into coefficient dictionary."""
-def parse_equation(equation):
     try:
         left, right = equation.split('=')
     except ValueError as e:
-        print("Error: Invalid equation format")
-        sys.exit(1)
+        raise ParseError("Invalid equation format")
     
     if not left.strip():
-        print("Error: Empty left side of equation")
-        sys.exit(1)
+        raise ParseError("Empty left side of equation")
     
     if not right.strip():
-        print("Error: Empty right side of equation")
-        sys.exit(1)
+        raise ParseError("Empty right side of equation")
 
     """Parse and validate one side of equation, returning terms dictionary."""
     def organize_equation_side(side):
         side = side.replace(" ", "")
-        side = expand_distributive(side)
+        if timings is None:
+            side = expand_products(side, limits)
+            side = expand_distributive(side)
+        else:
+            start = perf_counter()
+            side = expand_products(side, limits)
+            middle = perf_counter()
+            side = expand_distributive(side)
+            end = perf_counter()
+            timings["expand_products"] = timings.get("expand_products", 0.0) + middle - start
+            timings["expand_distributive"] = timings.get("expand_distributive", 0.0) + end - middle
+        check_expanded(side, limits)
         
         paren_count = 0
         for char in side:
@@ -36,12 +59,10 @@ def parse_equation(equation):
             elif char == ')':
                 paren_count -= 1
                 if paren_count < 0:
-                    print("Error: Unmatched closing parenthesis")
-                    sys.exit(1)
+                    raise ParseError("Unmatched closing parenthesis")
         
         if paren_count > 0:
-            print("Error: Unmatched opening parenthesis")
-            sys.exit(1)
+            raise ParseError("Unmatched opening parenthesis")
         
         if '(' in side or ')' in side:
             temp_side = side
@@ -52,57 +73,39 @@ def parse_equation(equation):
                 temp_side = temp_side[:power_match.start()] + "^VALID" + temp_side[power_match.end():]
             
             if '(' in temp_side or ')' in temp_side:
-                print("Error: Unsupported parentheses expression")
-                sys.exit(1)
+                raise ParseError("Unsupported parentheses expression")
         
         if re.search(r'[*^]{2,}', side):
-            print("Error: Consecutive operators")
-            sys.exit(1)
+            raise ParseError("Consecutive operators")
         if re.search(r'[+\-]{3,}', side):
-            print("Error: Consecutive operators")
-            sys.exit(1)
+            raise ParseError("Consecutive operators")
         if re.search(r'[+\-][*^]|[*^][+\-]', side):
-            print("Error: Consecutive operators")
-            sys.exit(1)
+            raise ParseError("Consecutive operators")
         if re.search(r'[*^][*^]', side):
-            print("Error: Consecutive operators")
-            sys.exit(1)
+            raise ParseError("Consecutive operators")
         
         if re.search(r'[0-9]\^[^+\-]*\^', side):
-            print("Error: Multiple exponentiation operators")
-            sys.exit(1)
+            raise ParseError("Multiple exponentiation operators")
         
         if re.search(r'[+\-*^]$', side):
-            print("Error: Trailing operator")
-            sys.exit(1)
+            raise ParseError("Trailing operator")
         
         terms = {}
-        matches = split_terms_with_parentheses(side)
-        
-        for term in matches:
-            if not term:
-                continue
-
-            try:
-                if re.search(r'[^0-9Xx\^\+\-\*/(). ]', term):
-                    raise ValueError("Invalid characters")
-            except ValueError as e:
-                print(f"Error: {e}")
-                sys.exit(1)
+        for start, end, sign in split_term_spans(side):
+            if INVALID_CHARACTERS.search(side, start, end):
+                raise ParseError("Invalid characters")
             
-            if re.search(r'/[^()]*[Xx]', term, re.IGNORECASE):
-                print("Error: Variables in denominators not supported")
-                sys.exit(1)
+            if VARIABLE_DENOMINATOR.search(side, start, end):
+                raise ParseError("Variables in denominators not supported")
             
-            if re.search(r'\^[\+\-\*/(). ]*$', term):
-                print("Error: Empty power")
-                sys.exit(1)
+            if EMPTY_POWER.search(side, start, end):
+                raise ParseError("Empty power")
             
-            if re.search(r'[+\-*^]$', term):
-                print("Error: Term ends with operator")
-                sys.exit(1)
+            if TRAILING_OPERATOR.search(side, start, end):
+                raise ParseError("Term ends with operator")
             
-            coeff, power = parse_term(term.strip())
+            coeff, power = parse_term(side[start:end], limits)
+            coeff *= sign
             
             if power in terms:
                 terms[power] += coeff
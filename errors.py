@@ -0,0 +1,12 @@
+"""
+Exception types raised by the parsing core.
+The command line turns them into an "Error: ..." line and an exit status.
+"""
+
+"""Raised when an equation cannot be parsed."""
+class ParseError(Exception):
+    exit_code = 1
+
+"""Raised when an equation exceeds a configured ParseLimits bound."""
+class LimitExceededError(ParseError):
+    exit_code = 2
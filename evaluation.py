@@ -0,0 +1,67 @@
+"""
+Polynomial evaluation module.
+Vectorized Horner evaluation of reduced polynomials over NumPy grids.
+"""
+
+from solver import degree
+
+"""Convert a coefficient dictionary to a NumPy vector, highest power first."""
+def coefficient_vector(coeffs):
+    import numpy as np
+
+    deg = degree(coeffs)
+    return np.array([coeffs.get(p, 0) for p in range(deg, -1, -1)], dtype=float)
+
+"""Stack coefficient dictionaries into a zero-padded matrix, one row per polynomial, highest power first."""
+def coefficient_matrix(coeff_dicts):
+    import numpy as np
+
+    deg = max((degree(coeffs) for coeffs in coeff_dicts), default=0)
+    matrix = np.zeros((len(coeff_dicts), deg + 1))
+    for row, coeffs in enumerate(coeff_dicts):
+        for p, c in coeffs.items():
+            if p <= deg:
+                matrix[row, deg - p] += c
+    return matrix
+
+"""Return coefficients as an array of shape (n_polys, n_coeffs) and whether a single polynomial was given."""
+def as_coefficient_array(coeffs):
+    import numpy as np
+
+    if isinstance(coeffs, dict):
+        coeffs = coefficient_vector(coeffs)
+    coeffs = np.asarray(coeffs)
+    coeffs = coeffs.astype(np.result_type(coeffs.dtype, float))
+    if coeffs.ndim == 1:
+        return coeffs[None, :], True
+    if coeffs.ndim != 2:
+        raise ValueError("Coefficients must be a dictionary, a vector or a 2-D matrix")
+    return coeffs, False
+
+"""Evaluate the polynomial(s) at every point of xs with Horner's scheme.
+
+coeffs is a parse_equation dictionary, a vector (highest power first) or a matrix
+with one polynomial per row. Returns an array shaped like xs, or (n_polys, *xs.shape).
+"""
+def evaluate(coeffs, xs):
+    import numpy as np
+
+    matrix, single = as_coefficient_array(coeffs)
+    xs = np.asarray(xs)
+    column = (slice(None),) + (None,) * xs.ndim
+    result = np.broadcast_to(matrix[:, 0][column], (len(matrix),) + xs.shape).astype(np.result_type(matrix.dtype, xs.dtype))
+    for k in range(1, matrix.shape[1]):
+        result = result * xs + matrix[:, k][column]
+    return result[0] if single else result
+
+"""Evaluate the first derivative of the polynomial(s) at every point of xs."""
+def evaluate_derivative(coeffs, xs):
+    import numpy as np
+
+    matrix, single = as_coefficient_array(coeffs)
+    n = matrix.shape[1] - 1
+    if n == 0:
+        derivative = np.zeros((len(matrix), 1), dtype=matrix.dtype)
+    else:
+        derivative = matrix[:, :-1] * np.arange(n, 0, -1)
+    return evaluate(derivative[0] if single else derivative, xs)
@@ -0,0 +1,167 @@
+"""
+Interval arithmetic module.
+Computes certified root enclosures with outward rounding built on math.nextafter.
+"""
+
+import math
+import operator
+from fractions import Fraction
+from solver import decimal_value
+
+"""Round a lower bound down by one ulp."""
+def down(x):
+    return math.nextafter(x, -math.inf)
+
+"""Round an upper bound up by one ulp."""
+def up(x):
+    return math.nextafter(x, math.inf)
+
+"""Return the tightest float bounds (lo, hi) around the exact value that rounded to r."""
+def enclose(r, exact):
+    if not math.isfinite(r):
+        return down(r), up(r)
+    error = Fraction(r) - exact
+    if error == 0:
+        return r, r
+    if error < 0:
+        return r, up(r)
+    return down(r), r
+
+"""Return float bounds (lo, hi) around the exact op(x, y).
+
+An infinite endpoint or an overflowing result widens the bounds to (-inf, inf), so
+signs depending on it are left undecided.
+"""
+def rounded(op, x, y):
+    r = op(x, y)
+    if not (math.isfinite(x) and math.isfinite(y) and math.isfinite(r)):
+        return -math.inf, math.inf
+    return enclose(r, op(Fraction(x), Fraction(y)))
+
+"""Bound the results of a binary operation over all endpoint pairs."""
+def bound(op, xs, ys):
+    lo, hi = math.inf, -math.inf
+    for x in xs:
+        for y in ys:
+            r_lo, r_hi = rounded(op, x, y)
+            lo, hi = min(lo, r_lo), max(hi, r_hi)
+    return lo, hi
+
+"""Closed interval [lo, hi] whose operations always enclose the exact result."""
+class Interval:
+    def __init__(self, lo, hi=None):
+        self.lo = lo
+        self.hi = lo if hi is None else hi
+
+    def __add__(self, other):
+        other = as_interval(other)
+        lo = rounded(operator.add, self.lo, other.lo)[0]
+        hi = rounded(operator.add, self.hi, other.hi)[1]
+        return Interval(lo, hi)
+
+    def __sub__(self, other):
+        other = as_interval(other)
+        lo = rounded(operator.sub, self.lo, other.hi)[0]
+        hi = rounded(operator.sub, self.hi, other.lo)[1]
+        return Interval(lo, hi)
+
+    def __neg__(self):
+        return Interval(-self.hi, -self.lo)
+
+    def __mul__(self, other):
+        other = as_interval(other)
+        return Interval(*bound(operator.mul, (self.lo, self.hi), (other.lo, other.hi)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = as_interval(other)
+        if other.lo <= 0 <= other.hi:
+            raise ZeroDivisionError("Interval division by an interval containing zero")
+        return Interval(*bound(operator.truediv, (self.lo, self.hi), (other.lo, other.hi)))
+
+    def sqrt(self):
+        if self.hi < 0:
+            raise ValueError("Cannot compute square root of negative interval")
+        lo = max(self.lo, 0.0)
+        return Interval(sqrt_bounds(lo)[0], sqrt_bounds(self.hi)[1])
+
+    def hull(self, other):
+        return Interval(min(self.lo, other.lo), max(self.hi, other.hi))
+
+    def sign(self):
+        if self.lo > 0:
+            return 1
+        if self.hi < 0:
+            return -1
+        if self.lo == 0 and self.hi == 0:
+            return 0
+        return None
+
+    def __repr__(self):
+        return f"[{self.lo!r}, {self.hi!r}]"
+
+"""Return float bounds (lo, hi) around the exact square root of x."""
+def sqrt_bounds(x):
+    r = math.sqrt(x)
+    if not math.isfinite(r):
+        return down(r), up(r)
+    error = Fraction(r) ** 2 - Fraction(x)
+    if error == 0:
+        return r, r
+    if error < 0:
+        return r, up(r)
+    return max(down(r), 0.0), r
+
+"""Return the tightest interval around the decimal_value of a parsed coefficient."""
+def coefficient(x):
+    if not math.isfinite(x):
+        return Interval(-math.inf, math.inf)
+    return Interval(*enclose(x, decimal_value(x)))
+
+"""Wrap a float as a degenerate interval."""
+def as_interval(x):
+    return x if isinstance(x, Interval) else Interval(x)
+
+"""Solve with interval arithmetic, returning output lines with an enclosure for every root."""
+def interval_lines(coeffs, deg):
+    lines = []
+    if deg == 0:
+        if abs(coeffs.get(0, 0)) < 1e-12:
+            lines.append("All real numbers are solution.")
+        else:
+            lines.append("No solution.")
+    elif deg == 1:
+        a = coefficient(coeffs.get(1, 0))
+        b = coefficient(coeffs.get(0, 0))
+        lines.append("The solution lies in:")
+        lines.append(str(-b / a))
+    elif deg == 2:
+        a = coefficient(coeffs.get(2, 0))
+        b = coefficient(coeffs.get(1, 0))
+        c = coefficient(coeffs.get(0, 0))
+        D = b * b - 4 * a * c
+        two_a = 2 * a
+        center = -b / two_a
+        sign = D.sign()
+        if sign == 1:
+            root = D.sqrt()
+            lines.append("Discriminant is certainly positive, the two solutions lie in:")
+            lines.append(str((-b + root) / two_a))
+            lines.append(str((-b - root) / two_a))
+        elif sign == 0:
+            lines.append("Discriminant is exactly zero, the solution lies in:")
+            lines.append(str(center))
+        elif sign == -1:
+            im_part = (-D).sqrt() / two_a
+            lines.append("Discriminant is certainly negative, no real solution. The solutions lie in:")
+            lines.append(f"{center} + {im_part}i")
+            lines.append(f"{center} - {im_part}i")
+        else:
+            spread = Interval(0.0, D.hi).sqrt() / two_a
+            lines.append(f"Discriminant sign cannot be decided (discriminant lies in {D}).")
+            lines.append("Real parts of the solutions lie in:")
+            lines.append(str((center - spread).hull(center + spread)))
+    else:
+        lines.append("The polynomial degree is strictly greater than 2, I can't solve.")
+    return lines
@@ -0,0 +1,52 @@
+"""
+Resource limits for equation parsing.
+Bounds the work a single equation may cost before it is rejected.
+"""
+
+from errors import LimitExceededError
+
+"""Upper bounds checked while parsing an equation."""
+class ParseLimits:
+    def __init__(self, max_length=10000, max_terms=1000, max_depth=32,
+                 max_expanded_length=100000, max_exponent=1000, max_degree=2):
+        self.max_length = max_length
+        self.max_terms = max_terms
+        self.max_depth = max_depth
+        self.max_expanded_length = max_expanded_length
+        self.max_exponent = max_exponent
+        self.max_degree = max_degree
+
+DEFAULT_LIMITS = ParseLimits()
+
+"""Raise the dedicated error for a limit violation."""
+def limit_exceeded(message):
+    raise LimitExceededError(f"Limit exceeded: {message}")
+
+"""Single pass over the raw equation checking length, term count and nesting depth."""
+def check_equation(equation, limits):
+    if len(equation) > limits.max_length:
+        limit_exceeded(f"input length {len(equation)} > {limits.max_length}")
+
+    depth = 0
+    terms = 1
+    for char in equation:
+        if char == '(':
+            depth += 1
+            if depth > limits.max_depth:
+                limit_exceeded(f"nesting depth > {limits.max_depth}")
+        elif char == ')':
+            depth -= 1
+        elif char in '+-=':
+            terms += 1
+            if terms > limits.max_terms:
+                limit_exceeded(f"term count > {limits.max_terms}")
+
+"""Check the size of a side after distributive expansion."""
+def check_expanded(expression, limits):
+    if len(expression) > limits.max_expanded_length:
+        limit_exceeded(f"expanded expression size > {limits.max_expanded_length}")
+
+"""Check a numeric exponent before it is evaluated."""
+def check_exponent(power, limits):
+    if abs(power) > limits.max_exponent:
+        limit_exceeded(f"exponent {power} > {limits.max_exponent}")
@@ -0,0 +1,195 @@
+"""
+Linear system module.
+Parses sets of linear equations in named variables into a sparse CSR matrix and solves them.
+"""
+
+import re
+import sys
+from collections import namedtuple
+from limits import DEFAULT_LIMITS, check_equation
+from errors import ParseError
+
+TERM = re.compile(r'\s*([+-])?\s*(?:(\d+(?:\.\d*)?|\.\d+)\s*(\*)?\s*)?([A-Za-z_]\w*)?\s*')
+DENSE_RANK_ENTRIES = 10**6
+PIVOT_TOLERANCE = 1e-10
+SHIFT_SCALE = 1e-14
+RESIDUAL_TOLERANCE = 1e-8
+
+"""Result of solve_system: status is "unique", "underdetermined" or "inconsistent"."""
+SystemSolution = namedtuple("SystemSolution", ["status", "rank", "solution", "residual"])
+
+"""Parse one side of a linear equation, calling add(name, coefficient) for every term.
+
+A term is an optional sign, an optional number, an optional '*' and an optional
+variable name; names are case-sensitive. Returns the sum of the constant terms.
+"""
+def parse_linear_side(side, add):
+    if not side.strip():
+        raise ParseError("Empty side of equation")
+    constant = 0.0
+    pos = 0
+    first = True
+    while pos < len(side):
+        match = TERM.match(side, pos)
+        sign, number, star, name = match.groups()
+        if match.end() == pos or (number is None and name is None) or (star and name is None):
+            raise ParseError(f"Invalid term at position {pos}")
+        if sign is None and not first:
+            raise ParseError(f"Missing operator at position {pos}")
+        value = float(number) if number is not None else 1.0
+        if sign == '-':
+            value = -value
+        if name is None:
+            constant += value
+        else:
+            add(name, value)
+        pos = match.end()
+        first = False
+    return constant
+
+"""Parse linear equations into (CSR matrix, right-hand side, variable names).
+
+Coefficients are appended row by row straight into CSR arrays; repeated variables
+within an equation are summed first. Variables are numbered by first appearance.
+Parse errors are raised as ParseError prefixed with the 1-based equation number.
+"""
+def parse_system(equations, limits=DEFAULT_LIMITS):
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    variables = {}
+    indptr = [0]
+    indices = []
+    data = []
+    rhs = []
+    for number, equation in enumerate(equations, 1):
+        row = {}
+
+        def add(name, value, scale=1.0):
+            column = variables.setdefault(name, len(variables))
+            row[column] = row.get(column, 0.0) + scale * value
+
+        try:
+            check_equation(equation, limits)
+            sides = equation.split('=')
+            if len(sides) != 2:
+                raise ParseError("Invalid equation format")
+            left = parse_linear_side(sides[0], add)
+            right = parse_linear_side(sides[1], lambda name, value: add(name, value, -1.0))
+        except ParseError as e:
+            raise type(e)(f"equation {number}: {e}") from None
+        for column, value in row.items():
+            if value != 0:
+                indices.append(column)
+                data.append(value)
+        indptr.append(len(indices))
+        rhs.append(right - left)
+
+    matrix = csr_matrix((np.array(data, dtype=float), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+                        shape=(len(rhs), len(variables)))
+    return matrix, np.array(rhs, dtype=float), list(variables)
+
+"""Count the significant pivots of a sparse LU factorization of a square matrix."""
+def significant_pivots(lu):
+    import numpy as np
+
+    pivots = np.abs(lu.U.diagonal())
+    return int(np.count_nonzero(pivots > PIVOT_TOLERANCE * pivots.max()))
+
+"""Estimate the numerical rank of a sparse matrix.
+
+Matrices of at most DENSE_RANK_ENTRIES entries use a dense SVD. Larger ones count the
+significant pivots of a sparse LU factorization: of the matrix itself when it is square
+and regular, otherwise of the matrix padded with zeros to a square and shifted by
+SHIFT_SCALE times its largest entry on the diagonal, so rank-deficient directions end
+as tiny pivots instead of an exactly singular factorization. The structural rank bounds
+the estimate. Returns (rank, LU factorization of the matrix when square and full rank, or None).
+"""
+def estimate_rank(matrix):
+    import numpy as np
+    from scipy.sparse import identity
+    from scipy.sparse.csgraph import structural_rank
+    from scipy.sparse.linalg import splu
+
+    rows, columns = matrix.shape
+    if matrix.nnz == 0:
+        return 0, None
+    if rows * columns <= DENSE_RANK_ENTRIES:
+        rank = int(np.linalg.matrix_rank(matrix.toarray()))
+        lu = splu(matrix.tocsc()) if rows == columns == rank else None
+        return rank, lu
+    structural = int(structural_rank(matrix))
+    if rows == columns == structural:
+        try:
+            lu = splu(matrix.tocsc())
+        except RuntimeError:
+            pass
+        else:
+            if significant_pivots(lu) == columns:
+                return columns, lu
+    size = max(rows, columns)
+    square = matrix.tocsr(copy=True)
+    square.resize(size, size)
+    shift = SHIFT_SCALE * float(abs(matrix).max())
+    lu = splu((square + shift * identity(size, format="csr")).tocsc())
+    return min(structural, significant_pivots(lu)), None
+
+"""Solve matrix @ x = rhs with a sparse direct solver, or least squares when rank deficient.
+
+A square full-rank system is solved by sparse LU. Otherwise LSMR gives a least-squares
+solution; the system is inconsistent when its residual is not negligible, and
+underdetermined (infinitely many solutions) when the rank is below the variable count.
+"""
+def solve_system(matrix, rhs):
+    import numpy as np
+    from scipy.sparse.linalg import lsmr
+
+    rank, lu = estimate_rank(matrix)
+    if lu is not None:
+        solution = lu.solve(rhs)
+    else:
+        solution = lsmr(matrix, rhs, atol=1e-14, btol=1e-14, maxiter=max(10 * matrix.shape[1], 1000))[0]
+    residual = float(np.linalg.norm(matrix @ solution - rhs)) if len(rhs) else 0.0
+    if residual > RESIDUAL_TOLERANCE * max(1.0, float(np.linalg.norm(rhs))):
+        status = "inconsistent"
+    elif rank < matrix.shape[1]:
+        status = "underdetermined"
+    else:
+        status = "unique"
+    return SystemSolution(status, rank, solution, residual)
+
+"""Return output lines describing the solution of a system."""
+def system_lines(names, rows, result):
+    lines = [f"System: {rows} equations, {len(names)} variables, rank {result.rank}"]
+    if result.status == "inconsistent":
+        lines.append(f"Inconsistent system, no solution (least-squares residual {result.residual:.3g}).")
+        return lines
+    if result.status == "underdetermined":
+        free = len(names) - result.rank
+        lines.append(f"Rank deficient system ({free} free variable{'s' if free != 1 else ''}), "
+                     "infinitely many solutions. One solution is:")
+    else:
+        lines.append("The solution is:")
+    lines.extend(f"{name} = {value}" for name, value in zip(names, result.solution.tolist()))
+    return lines
+
+"""Parse and solve the system in path (one equation per line), returning the exit status.
+
+Systems need NumPy and SciPy; when either is missing an error line is written instead.
+"""
+def solve_file(path, out=sys.stdout):
+    stream = sys.stdin if path == '-' else open(path, encoding="utf-8")
+    with stream:
+        equations = [line.strip() for line in stream if line.strip()]
+    try:
+        matrix, rhs, names = parse_system(equations)
+        result = solve_system(matrix, rhs)
+    except ParseError as e:
+        out.write(f"Error: {e}\n")
+        return e.exit_code
+    except ImportError as e:
+        out.write(f"Error: --system needs NumPy and SciPy ({e})\n")
+        return 1
+    for line in system_lines(names, len(equations), result):
+        out.write(line + "\n")
+    return 0
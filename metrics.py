@@ -0,0 +1,157 @@
+"""
+Batch metrics module.
+HDR-style latency histograms per pipeline stage and degree, live progress and slowest inputs.
+"""
+
+import heapq
+import json
+import sys
+import time
+
+SUB_BUCKET_BITS = 5
+SLOWEST_KEPT = 20
+
+"""Log-linear latency histogram with about 3% relative precision, recorded in microseconds."""
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.max = 0
+        self.total = 0
+
+    def record(self, seconds):
+        value = int(seconds * 1e6)
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        if not self.count:
+            return 0
+        target = q / 100 * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(bucket_upper(index), self.max)
+        return self.max
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count if self.count else 0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "max_us": self.max,
+            "buckets": {str(bucket_upper(i)): c for i, c in sorted(self.counts.items())},
+        }
+
+"""Map a value to its bucket: exact below 2**SUB_BUCKET_BITS, then 2**SUB_BUCKET_BITS buckets per power of two."""
+def bucket_index(value):
+    if value < (1 << SUB_BUCKET_BITS):
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+"""Return the largest value that falls into a bucket."""
+def bucket_upper(index):
+    if index < (1 << SUB_BUCKET_BITS):
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+"""Histograms, counters, slowest inputs and progress reporting for one batch run."""
+class BatchMetrics:
+    def __init__(self, total_bytes=None, progress_interval=None, out=None, start_offset=0):
+        self.stages = {}
+        self.degrees = {}
+        self.slowest = []
+        self.rows = 0
+        self.errors = 0
+        self.total_bytes = total_bytes
+        self.progress_interval = progress_interval
+        self.out = out
+        self.start_offset = start_offset
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.last_reported_rows = None
+
+    def record_stage(self, stage, seconds):
+        self.stages.setdefault(stage, LatencyHistogram()).record(seconds)
+
+    def record_row(self, row, seconds):
+        self.rows += 1
+        if "error" in row:
+            self.errors += 1
+            key = "error"
+        else:
+            key = f"degree {row.get('degree')}"
+        self.degrees.setdefault(key, LatencyHistogram()).record(seconds)
+        self.keep_slowest((seconds, row["line"], row["equation"]))
+
+    def keep_slowest(self, entry):
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def progress(self, bytes_done, force=False, rows_in_flight=0):
+        if self.progress_interval is None:
+            return
+        now = time.perf_counter()
+        if not force and now - self.last_report < self.progress_interval:
+            return
+        rows = self.rows + rows_in_flight
+        if rows == self.last_reported_rows:
+            return
+        self.last_report = now
+        self.last_reported_rows = rows
+        elapsed = now - self.started
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        line = f"[progress] {rows} equations, {rate:.0f} eq/s, {self.errors} errors"
+        if self.total_bytes and bytes_done > self.start_offset:
+            remaining = elapsed * (self.total_bytes - bytes_done) / (bytes_done - self.start_offset)
+            line += f", {100 * bytes_done / self.total_bytes:.1f}% done, ETA {format_duration(remaining)}"
+        print(line, file=self.out or sys.stderr, flush=True)
+
+    def merge(self, other):
+        for name, histogram in other.stages.items():
+            self.stages.setdefault(name, LatencyHistogram()).merge(histogram)
+        for name, histogram in other.degrees.items():
+            self.degrees.setdefault(name, LatencyHistogram()).merge(histogram)
+        for entry in other.slowest:
+            self.keep_slowest(entry)
+        self.rows += other.rows
+        self.errors += other.errors
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "errors": self.errors,
+            "elapsed_seconds": time.perf_counter() - self.started,
+            "stages": {name: h.to_dict() for name, h in sorted(self.stages.items())},
+            "degrees": {name: h.to_dict() for name, h in sorted(self.degrees.items())},
+            "slowest": [{"line": line, "equation": equation, "seconds": seconds}
+                        for seconds, line, equation in sorted(self.slowest, reverse=True)],
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+"""Format seconds as H:MM:SS."""
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
@@ -4,34 +4,78 @@ Handles parsing of mathematical expressions into coefficient dictionaries.
 """
 
 import re
-import sys
+from errors import ParseError
 
-"""Split expression into terms while respecting parentheses depth."""
-def split_terms_with_parentheses(expression):
-    terms = []
-    current_term = ""
+"""Regular expression compiled on first use, so importing the parser stays cheap.
+
+Attribute access (search, match, ...) is forwarded to the compiled pattern.
+"""
+class LazyPattern:
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+        self.compiled = None
+
+    def __getattr__(self, name):
+        if self.compiled is None:
+            self.compiled = re.compile(self.pattern, self.flags)
+        return getattr(self.compiled, name)
+
+"""Split expression[start:end] into (start, end, sign) term spans at parentheses depth zero.
+
+Each span covers a term without its leading sign run; sign is -1 when that run
+holds an odd number of minus signs. No substrings are built while scanning.
+"""
+def split_term_spans(expression, start=0, end=None):
+    if end is None:
+        end = len(expression)
+    spans = []
     paren_depth = 0
-    
-    for i, char in enumerate(expression):
+    body_start = None
+    sign = 1
+
+    for i in range(start, end):
+        char = expression[i]
         if char == '(':
             paren_depth += 1
-            current_term += char
         elif char == ')':
             paren_depth -= 1
-            current_term += char
         elif char in '+-' and paren_depth == 0:
-            if current_term and not re.match(r'^[+\-]*$', current_term):
-                terms.append(current_term)
-                current_term = char if char == '-' else ""
-            else:
-                current_term += char
-        else:
-            current_term += char
+            if body_start is not None:
+                spans.append((body_start, i, sign))
+                body_start = None
+                sign = -1 if char == '-' else 1
+            elif char == '-':
+                sign = -sign
+            continue
+        if body_start is None:
+            body_start = i
 
-    if current_term:
-        terms.append(current_term)
-    
-    return terms
+    if body_start is not None:
+        spans.append((body_start, end, sign))
+
+    return spans
+
+"""Split expression[start:end] into (start, end) factor spans at '*' signs of parentheses depth zero."""
+def split_factor_spans(expression, start=0, end=None):
+    if end is None:
+        end = len(expression)
+    spans = []
+    paren_depth = 0
+    factor_start = start
+
+    for i in range(start, end):
+        char = expression[i]
+        if char == '(':
+            paren_depth += 1
+        elif char == ')':
+            paren_depth -= 1
+        elif char == '*' and paren_depth == 0:
+            spans.append((factor_start, i))
+            factor_start = i + 1
+
+    spans.append((factor_start, end))
+    return spans
 
 """Expand distributive multiplication like 2*(x+1) to 2*x+2*1 and remove simple grouping parentheses."""
 def expand_distributive(expression):
@@ -89,12 +133,10 @@ def expand_distributive(expression):
         try:
             coeff = float(coeff_str) if coeff_str else 1
         except ValueError:
-            print("Error: Invalid coefficient in distributive multiplication")
-            sys.exit(1)
+            raise ParseError("Invalid coefficient in distributive multiplication")
 
         if re.search(r'[*/^]', expr_str):
-            print("Error: Complex expressions in parentheses not supported")
-            sys.exit(1)
+            raise ParseError("Complex expressions in parentheses not supported")
 
         terms = re.findall(r'[+-]?[^+-]+', expr_str)
         expanded_terms = []
@@ -153,6 +195,11 @@ def parse_power_expression(expr):
     if expr.startswith('(') and expr.endswith(')'):
         expr = expr[1:-1]
 
+    if '**' in expr:
+        raise ValueError("Consecutive operators")
+    if re.search(r'[0-9.)]\s*\(', expr):
+        raise ValueError(f"Invalid power expression: {expr}")
+
     try:
         if re.match(r'^[0-9+\-*/.\s()]+$', expr):
             result = eval(expr)
@@ -165,5 +212,5 @@ def parse_power_expression(expr):
                 return int(expr)
             else:
                 raise ValueError(f"Invalid power expression: {expr}")
-    except (ValueError, SyntaxError):
+    except (ValueError, SyntaxError, TypeError, ZeroDivisionError, OverflowError):
         raise ValueError(f"Invalid power expression: {expr}")
@@ -0,0 +1,76 @@
+"""
+Root polishing module.
+Refines roots with Newton steps on the reduced polynomial and reports residuals.
+"""
+
+DEFAULT_MAX_ITER = 8
+
+"""Return coefficients from highest to lowest power, up to the given degree."""
+def coefficient_list(coeffs, deg):
+    return [coeffs.get(p, 0) for p in range(deg, -1, -1)]
+
+"""Evaluate p(x) and p'(x) together with Horner's scheme."""
+def horner(coefficients, x):
+    p = coefficients[0]
+    dp = 0
+    for c in coefficients[1:]:
+        dp = dp * x + p
+        p = p * x + c
+    return p, dp
+
+"""Refine one root with Newton steps, returning (root, residual, iterations)."""
+def polish_root(coefficients, root, max_iter=DEFAULT_MAX_ITER):
+    p, dp = horner(coefficients, root)
+    iterations = 0
+    while iterations < max_iter and p != 0 and dp != 0:
+        candidate = root - p / dp
+        cp, cdp = horner(coefficients, candidate)
+        if abs(cp) >= abs(p):
+            break
+        root, p, dp = candidate, cp, cdp
+        iterations += 1
+    return root, abs(p), iterations
+
+"""Polish every root of a polynomial given as a coefficient dictionary."""
+def polish_roots(coeffs, roots, deg, max_iter=DEFAULT_MAX_ITER):
+    coefficients = coefficient_list(coeffs, deg)
+    return [polish_root(coefficients, r, max_iter) for r in roots]
+
+"""Polish a batch of roots at once with NumPy.
+
+coefficient_matrix has one row per polynomial (highest power first) and
+roots one row of starting points per polynomial; returns (roots, residuals, iterations).
+"""
+def polish_batch(coefficient_matrix, roots, max_iter=DEFAULT_MAX_ITER):
+    import numpy as np
+
+    coefficient_matrix = np.asarray(coefficient_matrix)
+    roots = np.asarray(roots)
+    roots = roots.astype(np.result_type(roots.dtype, coefficient_matrix.dtype, float))
+    coefficients = coefficient_matrix[:, :, None]
+
+    def evaluate(x):
+        p = np.broadcast_to(coefficients[:, 0], x.shape).astype(x.dtype)
+        dp = np.zeros_like(x)
+        for k in range(1, coefficients.shape[1]):
+            dp = dp * x + p
+            p = p * x + coefficients[:, k]
+        return p, dp
+
+    p, dp = evaluate(roots)
+    iterations = np.zeros(roots.shape, dtype=np.int64)
+    for _ in range(max_iter):
+        active = (p != 0) & (dp != 0)
+        if not active.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = np.where(active, roots - p / np.where(dp == 0, 1, dp), roots)
+        cp, cdp = evaluate(candidate)
+        improved = active & (np.abs(cp) < np.abs(p))
+        if not improved.any():
+            break
+        roots = np.where(improved, candidate, roots)
+        p = np.where(improved, cp, p)
+        dp = np.where(improved, cdp, dp)
+        iterations += improved
+    return roots, np.abs(p), iterations
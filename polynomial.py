@@ -0,0 +1,63 @@
+"""
+Polynomial coefficient arithmetic.
+Coefficient lists are ordered from the constant term upwards.
+"""
+
+"""Add two coefficient lists."""
+def add(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    result = list(a)
+    for i, c in enumerate(b):
+        result[i] += c
+    return result
+
+"""Multiply two coefficient lists by direct convolution, dropping trailing zero coefficients.
+
+Products are bounded by ParseLimits.max_degree before they are expanded, so operands stay
+a few coefficients long; trimming keeps degenerate groups such as (X-X+1)^1000 that short.
+"""
+def convolve(a, b):
+    if not a or not b:
+        return []
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x == 0:
+            continue
+        for j, y in enumerate(b):
+            result[i + j] += x * y
+    while len(result) > 1 and result[-1] == 0:
+        result.pop()
+    return result
+
+"""Raise a coefficient list to a non-negative integer power by repeated squaring."""
+def power(a, n):
+    result = [1]
+    while n > 0:
+        if n & 1:
+            result = convolve(result, a)
+        n >>= 1
+        if n:
+            a = convolve(a, a)
+    return result
+
+"""Format a number positionally so it never uses exponent notation."""
+def format_number(c):
+    from decimal import Decimal
+
+    return format(Decimal(repr(float(c))), 'f')
+
+"""Render a coefficient list as an expression the term parser accepts, e.g. '1.0*X^2-1.0'."""
+def to_expression(coefficients):
+    parts = []
+    for p in range(len(coefficients) - 1, -1, -1):
+        c = coefficients[p]
+        if c == 0:
+            continue
+        sign = "-" if c < 0 else "+"
+        number = format_number(-c if c < 0 else c)
+        parts.append(f"{sign}{number}*X^{p}" if p else f"{sign}{number}")
+    if not parts:
+        return "0"
+    expression = "".join(parts)
+    return expression[1:] if expression.startswith("+") else expression
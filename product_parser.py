@@ -0,0 +1,112 @@
+"""
+Product expansion module.
+Expands products and integer powers of parenthesized polynomial groups,
+e.g. (X+1)*(X-2) or (X+1)^2, by coefficient convolution.
+"""
+
+from parser import LazyPattern, split_term_spans, split_factor_spans, parse_power_expression
+from term_parser import parse_term
+from limits import DEFAULT_LIMITS, check_exponent
+import polynomial
+from errors import ParseError
+
+VARIABLE = LazyPattern(r'[Xx]')
+
+"""Locate a group factor in expression[start:end] as (inner_start, inner_end, power_start), or None.
+
+power_start is None when the group is not raised to a power.
+"""
+def split_group(expression, start, end):
+    if start >= end or expression[start] != '(':
+        return None
+    depth = 0
+    for i in range(start, end):
+        char = expression[i]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                if i + 1 == end:
+                    return start + 1, i, None
+                if expression[i + 1] == '^':
+                    return start + 1, i, i + 2
+                return None
+    return None
+
+"""Return True if the term expression[start:end] multiplies or raises polynomial groups."""
+def needs_expansion(expression, start, end):
+    has_group = False
+    with_variable = 0
+    for factor_start, factor_end in split_factor_spans(expression, start, end):
+        group = split_group(expression, factor_start, factor_end)
+        if group is not None:
+            if group[2] is not None:
+                return True
+            has_group = True
+        if VARIABLE.search(expression, factor_start, factor_end):
+            with_variable += 1
+    return has_group and with_variable >= 2
+
+"""Convert the sum expression[start:end] into a coefficient list."""
+def sum_coefficients(expression, start, end, limits):
+    result = [0]
+    for term_start, term_end, sign in split_term_spans(expression, start, end):
+        result = polynomial.add(result, product_coefficients(expression, term_start, term_end, sign, limits))
+    return result
+
+"""Return the degree of a coefficient list, ignoring zero leading coefficients."""
+def degree_of(coefficients):
+    for k in range(len(coefficients) - 1, 0, -1):
+        if coefficients[k] != 0:
+            return k
+    return 0
+
+"""Reject a product whose degree exceeds limits.max_degree before it is expanded."""
+def check_degree(deg, limits):
+    if deg > limits.max_degree:
+        raise ParseError(f"Invalid power: {deg}")
+
+"""Convert the product expression[start:end] of factors and group powers into a coefficient list."""
+def product_coefficients(expression, start, end, sign, limits):
+    result = [sign]
+    for factor_start, factor_end in split_factor_spans(expression, start, end):
+        if factor_start == factor_end:
+            raise ParseError("Empty factor in product")
+        group = split_group(expression, factor_start, factor_end)
+        if group is None:
+            coeff, power = parse_term(expression[factor_start:factor_end], limits)
+            factor_coefficients = [0] * power + [coeff]
+        else:
+            inner_start, inner_end, power_start = group
+            factor_coefficients = sum_coefficients(expression, inner_start, inner_end, limits)
+            if power_start is not None:
+                try:
+                    power = parse_power_expression(expression[power_start:factor_end])
+                except ValueError as e:
+                    raise ParseError(str(e))
+                if power < 0:
+                    raise ParseError("Negative powers of groups not supported")
+                check_exponent(power, limits)
+                check_degree(degree_of(factor_coefficients) * power, limits)
+                factor_coefficients = polynomial.power(factor_coefficients, power)
+        check_degree(degree_of(result) + degree_of(factor_coefficients), limits)
+        result = polynomial.convolve(result, factor_coefficients)
+    return result
+
+"""Expand every term that multiplies or raises polynomial groups, leaving other terms untouched."""
+def expand_products(expression, limits=DEFAULT_LIMITS):
+    spans = split_term_spans(expression)
+    if not any(needs_expansion(expression, start, end) for start, end, _ in spans):
+        return expression
+
+    parts = []
+    for start, end, sign in spans:
+        if needs_expansion(expression, start, end):
+            term = polynomial.to_expression(product_coefficients(expression, start, end, sign, limits))
+            if not term.startswith('-'):
+                term = '+' + term
+        else:
+            term = ('-' if sign < 0 else '+') + expression[start:end]
+        parts.append(term)
+    return "".join(parts).lstrip('+')
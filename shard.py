@@ -0,0 +1,91 @@
+"""
+Sharding module.
+Splits batch input across machines by a stable hash and merges the per-shard results back.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from store import normalize_equation
+
+"""Return the shard of an equation from a stable hash of its normalized text.
+
+Spellings that normalize alike land on the same shard, so per-node dedupe and
+result stores see every repeat of a polynomial.
+"""
+def shard_of(equation, shards):
+    digest = hashlib.blake2b(normalize_equation(equation).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+"""Return the input file path of every shard in directory."""
+def shard_paths(directory, shards):
+    return [os.path.join(directory, f"shard-{k:05d}-of-{shards:05d}.txt") for k in range(shards)]
+
+"""Yield (line number, equation) for every non-blank line, numbered like batch mode."""
+def read_equations(stream):
+    for lineno, raw in enumerate(stream, 1):
+        equation = raw.decode("utf-8").rstrip('\r\n')
+        if equation.strip():
+            yield lineno, equation
+
+"""Split input_path into shards files in directory, returning the exit status."""
+def split_input(input_path, shards, directory=None):
+    if shards < 1:
+        print("Error: shard count must be at least 1", file=sys.stderr)
+        return 1
+    if directory is None:
+        directory = os.path.dirname(os.path.abspath(input_path))
+    os.makedirs(directory, exist_ok=True)
+    paths = shard_paths(directory, shards)
+    outputs = [open(path, "wb") for path in paths]
+    counts = [0] * shards
+    try:
+        with open(input_path, "rb") as stream:
+            for _, equation in read_equations(stream):
+                k = shard_of(equation, shards)
+                outputs[k].write(equation.encode("utf-8") + b"\n")
+                counts[k] += 1
+    finally:
+        for out in outputs:
+            out.close()
+    for path, count in zip(paths, counts):
+        print(f"{path}: {count} equations", file=sys.stderr)
+    return 0
+
+"""Merge per-shard batch results back into the order of input_path, returning the exit status.
+
+result_paths holds one batch output file per shard, in shard order. Each input line is
+routed to its shard again and takes the next row of that shard, whose line number is
+rewritten to the original one.
+"""
+def merge_results(input_path, result_paths, output_path=None):
+    shards = len(result_paths)
+    results = [open(path, "rb") for path in result_paths]
+    out = open(output_path, "wb") if output_path not in (None, '-') else sys.stdout.buffer
+    try:
+        with open(input_path, "rb") as stream:
+            for lineno, equation in read_equations(stream):
+                k = shard_of(equation, shards)
+                raw = results[k].readline()
+                if not raw:
+                    print(f"Error: {result_paths[k]} ends before line {lineno}", file=sys.stderr)
+                    return 1
+                row = json.loads(raw)
+                if row.get("equation") != equation:
+                    print(f"Error: {result_paths[k]} does not match line {lineno}", file=sys.stderr)
+                    return 1
+                row["line"] = lineno
+                out.write((json.dumps(row) + "\n").encode("utf-8"))
+        for path, result in zip(result_paths, results):
+            if result.readline():
+                print(f"Error: {path} has more rows than its shard of the input", file=sys.stderr)
+                return 1
+    finally:
+        for result in results:
+            result.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    return 0
@@ -0,0 +1,124 @@
+"""
+Shared-memory parallel solve module.
+Solves large quadratic coefficient matrices in worker processes without pickling arrays.
+"""
+
+import os
+import sys
+from multiprocessing import Pool, resource_tracker, shared_memory
+
+MIN_ROWS_PER_TASK = 65536
+
+"""Solve rows of [a, b, c] (highest power first) into roots in place, vectorized.
+
+Each row of roots receives the two roots (-b + sqrt(D)) / 2a and (-b - sqrt(D)) / 2a
+as complex numbers, in the order solver.solution_lines prints them. Linear rows
+(a == 0) get -c / b twice; constant rows get NaN.
+"""
+def solve_block(coefficients, roots):
+    import numpy as np
+
+    a, b, c = coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt((b*b - 4*a*c).astype(complex))
+        two_a = 2*a
+        roots[:, 0] = (-b + root) / two_a
+        roots[:, 1] = (-b - root) / two_a
+        linear = a == 0
+        if linear.any():
+            roots[linear, :] = np.where(b[linear] == 0, np.nan, -c[linear] / b[linear])[:, None]
+    return roots
+
+"""Attach to a shared block created by another process without taking ownership of it.
+
+Python 3.13 attaches untracked. Before it, attaching registers the block with the
+resource tracker, which would unlink it when the worker exits, so the registration is
+always withdrawn; solve_shared registers its blocks again before unlinking them.
+"""
+def attach(name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    block = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+"""Attach to the shared input and output arrays and solve rows start to stop in place."""
+def solve_shared_slice(task):
+    import numpy as np
+
+    in_name, out_name, rows, start, stop = task
+    source = attach(in_name)
+    target = attach(out_name)
+    try:
+        coefficients = np.ndarray((rows, 3), dtype=np.float64, buffer=source.buf)
+        roots = np.ndarray((rows, 2), dtype=np.complex128, buffer=target.buf)
+        solve_block(coefficients[start:stop], roots[start:stop])
+        del coefficients, roots
+    finally:
+        source.close()
+        target.close()
+    return stop - start
+
+"""Return (start, stop) slices splitting rows into about one task per worker."""
+def slices(rows, workers):
+    tasks = max(1, min(workers, rows // MIN_ROWS_PER_TASK))
+    bounds = [rows * k // tasks for k in range(tasks + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+"""Solve an (n, 3) coefficient matrix in parallel through shared memory, returning (n, 2) complex roots.
+
+The coefficients are copied once into a shared block and workers write roots into a
+second one; only block names and row bounds cross process boundaries. A running
+pool may be passed in to be reused across calls.
+"""
+def solve_shared(coefficients, workers=None, pool=None):
+    import numpy as np
+
+    coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+    if coefficients.ndim != 2 or coefficients.shape[1] != 3:
+        raise ValueError("Coefficients must be an (n, 3) matrix of quadratic coefficients")
+    rows = len(coefficients)
+    workers = workers or os.cpu_count() or 1
+    if rows == 0:
+        return np.empty((0, 2), dtype=np.complex128)
+
+    source = shared_memory.SharedMemory(create=True, size=coefficients.nbytes)
+    target = shared_memory.SharedMemory(create=True, size=rows * 2 * np.dtype(np.complex128).itemsize)
+    try:
+        np.ndarray(coefficients.shape, dtype=np.float64, buffer=source.buf)[:] = coefficients
+        tasks = [(source.name, target.name, rows, start, stop) for start, stop in slices(rows, workers)]
+        if pool is None:
+            with Pool(workers) as owned:
+                owned.map(solve_shared_slice, tasks)
+        else:
+            pool.map(solve_shared_slice, tasks)
+        roots = np.ndarray((rows, 2), dtype=np.complex128, buffer=target.buf).copy()
+    finally:
+        if sys.version_info < (3, 13):
+            resource_tracker.register(source._name, "shared_memory")
+            resource_tracker.register(target._name, "shared_memory")
+        source.close()
+        source.unlink()
+        target.close()
+        target.unlink()
+    return roots
+
+"""Solve one pickled block of coefficients and return its roots."""
+def solve_pickled_block(coefficients):
+    import numpy as np
+
+    return solve_block(coefficients, np.empty((len(coefficients), 2), dtype=np.complex128))
+
+"""Solve like solve_shared but send coefficient and root blocks through pickling, for comparison."""
+def solve_pickled(coefficients, workers=None, pool=None):
+    import numpy as np
+
+    coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+    workers = workers or os.cpu_count() or 1
+    blocks = [coefficients[start:stop] for start, stop in slices(len(coefficients), workers)]
+    if pool is None:
+        with Pool(workers) as owned:
+            results = owned.map(solve_pickled_block, blocks)
+    else:
+        results = pool.map(solve_pickled_block, blocks)
+    return np.concatenate(results) if results else np.empty((0, 2), dtype=np.complex128)
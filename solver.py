@@ -3,6 +3,9 @@ Polynomial solver module.
 Contains functions for solving quadratic equations and formatting output.
 """
 
+import builtins
+import math
+import sys
 from math_utils import abs, sqrt
 
 """Convert coefficient dictionary to readable polynomial string."""
@@ -49,40 +52,166 @@ def degree(coeffs):
     deg = max((p for p, c in coeffs.items() if abs(c) > 1e-12), default=0)
     return deg
 
-"""Solve the polynomial equation based on its degree."""
-def solve(coeffs):
+ESCALATION_MARGIN = 16
+DECIMAL_DIGITS = 50
+MIN_NORMAL = sys.float_info.min
+SQRT_LIMIT = 1e13
+EXACT_INTEGER_LIMIT = 2**25
+
+"""Return True when b*b - 4*a*c is computed without rounding: integer inputs below EXACT_INTEGER_LIMIT."""
+def exact_in_float(a, b, c):
+    return all(float(x).is_integer() and abs(x) < EXACT_INTEGER_LIMIT for x in (a, b, c))
+
+"""Return (D, trusted) for the float discriminant D = b*b - 4*a*c.
+
+trusted is True when D is finite, neither product lost its relative precision to
+overflow or underflow, and |D| exceeds ESCALATION_MARGIN times the rounding error of
+its two terms, so the sign of D is right. Works elementwise on NumPy arrays as well as
+on floats, so the solver and classify share this one test.
+"""
+def float_discriminant(a, b, c):
+    size = builtins.abs
+    bb = b*b
+    ac4 = 4*a*c
+    D = bb - ac4
+    trusted = ((size(D) < math.inf)
+               & ((bb != 0) | (b == 0)) & ((bb == 0) | (size(bb) >= MIN_NORMAL))
+               & ((ac4 != 0) | (a == 0) | (c == 0)) & ((ac4 == 0) | (size(ac4) >= MIN_NORMAL))
+               & (size(D) > ESCALATION_MARGIN * sys.float_info.epsilon * (bb + size(ac4))))
+    return D, trusted
+
+"""Return x as the exact Fraction of its shortest decimal representation.
+
+The shortest repr of a parsed coefficient recovers the decimal literal it came from,
+so 0.1 stands for 1/10 rather than its binary rounding.
+"""
+def decimal_value(x):
+    from fractions import Fraction
+
+    return Fraction(repr(x))
+
+"""Estimate in float whether the discriminant sign can be trusted, returning "float" or "exact".
+
+b*b - 4*a*c is rounded to within a few ulps of its two terms; when |D| is within
+ESCALATION_MARGIN times that error, outside the range the float path handles (below
+its 1e-12 tolerance, or above SQRT_LIMIT where math_utils.sqrt cannot reach its
+absolute tolerance), or a product overflowed or underflowed, the quadratic has to
+be re-solved exactly. Small integer coefficients give an exact float discriminant
+and are only escalated past SQRT_LIMIT.
+"""
+def quadratic_precision(a, b, c):
+    if exact_in_float(a, b, c):
+        return "float" if abs(b*b - 4*a*c) <= SQRT_LIMIT else "exact"
+    D, trusted = float_discriminant(a, b, c)
+    if not trusted or not 1e-12 <= abs(D) <= SQRT_LIMIT:
+        return "exact"
+    return "float"
+
+"""Return the arithmetic solution_lines uses for these coefficients: "float" or "exact"."""
+def solve_precision(coeffs):
+    if degree(coeffs) != 2:
+        return "float"
+    return quadratic_precision(coeffs.get(2, 0), coeffs.get(1, 0), coeffs.get(0, 0))
+
+"""Convert a Fraction to a Decimal in the current context."""
+def to_decimal(x):
+    from decimal import Decimal
+
+    return Decimal(x.numerator) / Decimal(x.denominator)
+
+"""Solve an ill-conditioned quadratic with an exact discriminant and high precision roots.
+
+Coefficients are taken at their decimal_value, so the discriminant sign is decided
+exactly. Roots use DECIMAL_DIGITS significant digits and the cancellation-free formula.
+"""
+def exact_quadratic_lines(coeffs, a, b, c, polish=False):
+    from decimal import localcontext
+
+    A, B, C = (decimal_value(x) for x in (a, b, c))
+    D = B*B - 4*A*C
+    lines = []
+    with localcontext() as context:
+        context.prec = DECIMAL_DIGITS
+        if D > 0:
+            root = to_decimal(D).sqrt()
+            q = -(to_decimal(B) + root.copy_sign(to_decimal(B))) / 2
+            sols = [q / to_decimal(A), to_decimal(C) / q]
+            if B >= 0:
+                sols.reverse()
+            lines.append("Discriminant is strictly positive, the two solutions are:")
+            lines.extend(root_lines(coeffs, [float(sol) for sol in sols], 2, polish))
+        elif D == 0:
+            lines.append("Discriminant is zero, the solution is:")
+            lines.extend(root_lines(coeffs, [float(-B / (2*A))], 2, polish))
+        else:
+            lines.append("Discriminant is strictly negative, no real solution.")
+            im_part = float(to_decimal(-D).sqrt() / to_decimal(2*A))
+            lines.extend(complex_lines(coeffs, float(-B / (2*A)), im_part, polish))
+    return lines
+
+"""Format a complex conjugate pair, polishing it first if asked."""
+def complex_lines(coeffs, re_part, im_part, polish=False):
+    if polish:
+        from polish import polish_roots
+        root, residual, iterations = polish_roots(coeffs, [complex(re_part, im_part)], 2)[0]
+        re_part, im_part = root.real, root.imag
+        suffix = f" (residual {residual:.3g}, {iterations} iterations)"
+    else:
+        suffix = ""
+    return [f"{re_part} + {im_part}i{suffix}", f"{re_part} - {im_part}i{suffix}"]
+
+"""Format real roots, polishing them first and reporting residual and Newton iterations if asked."""
+def root_lines(coeffs, sols, deg, polish=False):
+    if not polish:
+        return [str(sol) for sol in sols]
+    from polish import polish_roots
+    return [f"{root} (residual {residual:.3g}, {iterations} iterations)"
+            for root, residual, iterations in polish_roots(coeffs, sols, deg)]
+
+"""Compute the output lines describing the solutions of the polynomial."""
+def solution_lines(coeffs, polish=False, intervals=False):
     deg = degree(coeffs)
+    if intervals:
+        from intervals import interval_lines
+        return interval_lines(coeffs, deg)
+    lines = []
     if deg == 0:
         if abs(coeffs.get(0, 0)) < 1e-12:
-            print("All real numbers are solution.")
+            lines.append("All real numbers are solution.")
         else:
-            print("No solution.")
+            lines.append("No solution.")
     elif deg == 1:
         a = coeffs.get(1, 0)
         b = coeffs.get(0, 0)
         sol = -b / a
-        print("The solution is:")
-        print(sol)
+        lines.append("The solution is:")
+        lines.extend(root_lines(coeffs, [sol], deg, polish))
     elif deg == 2:
         a = coeffs.get(2, 0)
         b = coeffs.get(1, 0)
         c = coeffs.get(0, 0)
+        if quadratic_precision(a, b, c) == "exact":
+            return exact_quadratic_lines(coeffs, a, b, c, polish)
         D = b*b - 4*a*c
         if D > 0:
-            print("Discriminant is strictly positive, the two solutions are:")
-            sol1 = (-b + sqrt(D)) / (2*a)
-            sol2 = (-b - sqrt(D)) / (2*a)
-            print(sol1)
-            print(sol2)
-        elif abs(D) < 1e-12:
-            print("Discriminant is zero, the solution is:")
-            sol = -b / (2*a)
-            print(sol)
+            lines.append("Discriminant is strictly positive, the two solutions are:")
+            sols = [(-b + sqrt(D)) / (2*a), (-b - sqrt(D)) / (2*a)]
+            lines.extend(root_lines(coeffs, sols, deg, polish))
+        elif D == 0:
+            lines.append("Discriminant is zero, the solution is:")
+            lines.extend(root_lines(coeffs, [-b / (2*a)], deg, polish))
         else:
-            print("Discriminant is strictly negative, no real solution.")
-            re_part = -b / (2*a)
-            im_part = sqrt(-D) / (2*a)
-            print(f"{re_part} + {im_part}i")
-            print(f"{re_part} - {im_part}i")
+            lines.append("Discriminant is strictly negative, no real solution.")
+            lines.extend(complex_lines(coeffs, -b / (2*a), sqrt(-D) / (2*a), polish))
+    else:
+        lines.append("The polynomial degree is strictly greater than 2, I can't solve.")
+    return lines
+
+"""Solve the polynomial equation based on its degree."""
+def solve(coeffs, polish=False, intervals=False, cache=None):
+    if cache is None:
+        lines = solution_lines(coeffs, polish, intervals)
     else:
-        print("The polynomial degree is strictly greater than 2, I can't solve.")
+        lines = cache.solution_lines(coeffs, polish, intervals)
+    for line in lines:
+        print(line)
@@ -0,0 +1,89 @@
+"""
+Persistent result store.
+Caches parsed coefficients and solutions in a local SQLite file shared by runs and processes.
+"""
+
+import json
+import re
+import sqlite3
+import time
+
+SCHEMA_VERSION = 2
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+LOOKUP_CHUNK = 500
+EVICT_FRACTION = 0.1
+
+WHITESPACE = re.compile(r'\s+')
+
+"""Normalize equation text so trivially different spellings share one entry."""
+def normalize_equation(equation):
+    return WHITESPACE.sub('', equation).replace('x', 'X')
+
+"""SQLite-backed map from (normalized equation, mode) to a result record.
+
+Records are dictionaries with either "error", or "coeffs", "reduced", "degree"
+and "solution". WAL journaling lets many worker processes read concurrently.
+"""
+class ResultStore:
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None or int(row[0]) != SCHEMA_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS results")
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                                        (str(SCHEMA_VERSION),))
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "equation TEXT NOT NULL, mode TEXT NOT NULL, record TEXT NOT NULL, "
+                "stored REAL NOT NULL, PRIMARY KEY (equation, mode))")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_stored ON results (stored)")
+
+    def get_many(self, equations, mode=""):
+        keys = list(dict.fromkeys(normalize_equation(e) for e in equations))
+        found = {}
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[i:i + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT equation, record FROM results WHERE mode = ? AND equation IN ({placeholders})",
+                [mode] + chunk).fetchall()
+            for key, record in rows:
+                found[key] = json.loads(record)
+        return {e: found[normalize_equation(e)] for e in equations if normalize_equation(e) in found}
+
+    def put_many(self, records, mode=""):
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                [(normalize_equation(e), mode, json.dumps(record), now) for e, record in records.items()])
+        self.evict()
+
+    def size_bytes(self):
+        page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.connection.execute("PRAGMA page_count").fetchone()[0]
+        free = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
+
+    def evict(self):
+        while self.size_bytes() > self.max_bytes:
+            count = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count == 0:
+                break
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY stored LIMIT ?)",
+                    (max(1, int(count * EVICT_FRACTION)),))
+
+    def close(self):
+        self.connection.close()
@@ -4,11 +4,12 @@ Handles parsing of individual terms in polynomial expressions.
 """
 
 import re
-import sys
-from parser import parse_power_expression
+from parser import parse_power_expression, split_factor_spans
+from limits import DEFAULT_LIMITS, check_exponent, limit_exceeded
+from errors import ParseError
 
 """Parse a single term to extract coefficient and power."""
-def parse_term(term):
+def parse_term(term, limits=DEFAULT_LIMITS):
     if not term:
         return 0, 0
 
@@ -29,29 +30,9 @@ def parse_term(term):
                 temp_term = temp_term[:power_match.start()] + "^VALID" + temp_term[power_match.end():]
             
             if '(' in temp_term or ')' in temp_term:
-                print("Error: Unexpected parentheses in term")
-                sys.exit(1)
+                raise ParseError("Unexpected parentheses in term")
         
-        parts = []
-        current_part = ""
-        paren_depth = 0
-        
-        for char in term:
-            if char == '(':
-                paren_depth += 1
-                current_part += char
-            elif char == ')':
-                paren_depth -= 1
-                current_part += char
-            elif char == '*' and paren_depth == 0:
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-            else:
-                current_part += char
-        
-        if current_part:
-            parts.append(current_part)
+        parts = [term[start:end] for start, end in split_factor_spans(term) if start < end]
         coeff = 1
         total_power = 0
         has_variable = False
@@ -68,8 +49,7 @@ def parse_term(term):
                     power_part = match.group(2)
                     
                     if '(' in var_coeff_part or ')' in var_coeff_part:
-                        print("Error: Parentheses in coefficients not supported")
-                        sys.exit(1)
+                        raise ParseError("Parentheses in coefficients not supported")
                     
                     if var_coeff_part == '' or var_coeff_part == '+':
                         var_coeff = 1
@@ -79,8 +59,7 @@ def parse_term(term):
                         try:
                             var_coeff = float(var_coeff_part)
                         except ValueError:
-                            print("Error: Invalid coefficient format")
-                            sys.exit(1)
+                            raise ParseError("Invalid coefficient format")
                     
                     coeff *= var_coeff
                     
@@ -91,29 +70,22 @@ def parse_term(term):
                         try:
                             part_power = parse_power_expression(power_expr)
                         except ValueError as e:
-                            print(f"Error: {e}")
-                            sys.exit(1)
+                            raise ParseError(str(e))
                     
                     total_power += part_power
             else:
                 if '(' in part or ')' in part:
-                    print("Error: Parentheses in coefficients not supported")
-                    sys.exit(1)
+                    raise ParseError("Parentheses in coefficients not supported")
                 
                 try:
                     num_coeff = float(part) if part else 1
                     coeff *= num_coeff
                 except ValueError:
-                    print("Error: Invalid coefficient format")
-                    sys.exit(1)
+                    raise ParseError("Invalid coefficient format")
         
         if has_variable:
-            try:
-                if total_power not in [0, 1, 2]:
-                    raise ValueError(f"Invalid power: {total_power}")
-            except ValueError as e:
-                print(f"Error: {e}")
-                sys.exit(1)
+            if total_power not in [0, 1, 2]:
+                raise ParseError(f"Invalid power: {total_power}")
                 
             return sign * coeff, total_power
         else:
@@ -121,8 +93,7 @@ def parse_term(term):
     
     elif 'X' in term.upper():
         if re.search(r'\d+\^[Xx]', term, re.IGNORECASE):
-            print("Error: Exponential expressions not allowed")
-            sys.exit(1)
+            raise ParseError("Exponential expressions not allowed")
         
         var_pattern = r'^([^Xx]*)[Xx]([0-9]*\.?[0-9]*)(\^.*)?$'
         match = re.match(var_pattern, term, re.IGNORECASE)
@@ -133,8 +104,7 @@ def parse_term(term):
             power_part = match.group(3)
             
             if '^' in coeff_part:
-                print("Error: Invalid coefficient format")
-                sys.exit(1)
+                raise ParseError("Invalid coefficient format")
             
             if coeff_part == '' or coeff_part == '+':
                 coeff = 1
@@ -151,16 +121,14 @@ def parse_term(term):
                     else:
                         coeff = float(coeff_part)
                 except (ValueError, SyntaxError, ZeroDivisionError):
-                    print("Error: Invalid coefficient format")
-                    sys.exit(1)
+                    raise ParseError("Invalid coefficient format")
             
             if additional_coeff_part and additional_coeff_part != '1':
                 try:
                     additional_coeff = float(additional_coeff_part)
                     coeff *= additional_coeff
                 except ValueError:
-                    print("Error: Invalid coefficient format")
-                    sys.exit(1)
+                    raise ParseError("Invalid coefficient format")
             
             if power_part is None:
                 power = 1
@@ -169,46 +137,39 @@ def parse_term(term):
                 try:
                     power = parse_power_expression(power_expr)
                 except ValueError as e:
-                    print(f"Error: {e}")
-                    sys.exit(1)
+                    raise ParseError(str(e))
                 
-                try:
-                    if power not in [0, 1, 2]:
-                        raise ValueError(f"Invalid power: {power}")
-                except ValueError as e:
-                    print(f"Error: {e}")
-                    sys.exit(1)
+                if power not in [0, 1, 2]:
+                    raise ParseError(f"Invalid power: {power}")
 
             return sign * coeff, power
         else:
-            print("Error: Invalid term format")
-            sys.exit(1)
+            raise ParseError("Invalid term format")
     else:
         if '^' in term:
             if term.count('^') > 1:
-                print("Error: Multiple ^ operators")
-                sys.exit(1)
+                raise ParseError("Multiple ^ operators")
             
             base_and_power = term.split('^', 1)
             base_part = base_and_power[0]
             power_part = base_and_power[1]
             
             if 'X' in power_part.upper():
-                print("Error: Variables in exponents not allowed")
-                sys.exit(1)
+                raise ParseError("Variables in exponents not allowed")
             
             try:
                 base = float(base_part)
                 power_value = parse_power_expression(power_part)
+                check_exponent(power_value, limits)
                 result = base ** power_value
                 return sign * result, 0
-            except (ValueError, TypeError) as e:
-                print(f"Error: Invalid number power expression - {e}")
-                sys.exit(1)
+            except OverflowError:
+                limit_exceeded(f"value of {base_part}^{power_part} out of range")
+            except (ValueError, TypeError, ZeroDivisionError) as e:
+                raise ParseError(f"Invalid number power expression - {e}")
         else:
             try:
                 coeff = float(term) if term else 0
                 return sign * coeff, 0
             except ValueError:
-                print("Error: Invalid constant term")
-                sys.exit(1)
+                raise ParseError("Invalid constant term")
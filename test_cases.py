@@ -8,7 +8,8 @@ import subprocess
 import sys
 import os
 
-def run_test(equation, expected_result=None, should_fail=False, description="", expected_degree=None):
+def run_test(equation, expected_result=None, should_fail=False, description="", expected_degree=None, 
+             flags=(), expected_output=None):
     """Run a single test case"""
     print(f"\n{'='*80}")
     print(f"Test: {description}")
@@ -19,7 +20,7 @@ def run_test(equation, expected_result=None, should_fail=False, description="",
     print("-" * 80)
     
     try:
-        result = subprocess.run([sys.executable, "computor.py", equation], 
+        result = subprocess.run([sys.executable, "computor.py", *flags, equation], 
                                capture_output=True, text=True, timeout=10)
         
         if result.returncode == 0:
@@ -43,6 +44,13 @@ def run_test(equation, expected_result=None, should_fail=False, description="",
                             else:
                                 print(f"❌ Degree mismatch: Expected {expected_degree}, got {actual_degree}")
                             break
+                
+                # Check that expected fragments appear in the output
+                for fragment in expected_output or []:
+                    if fragment in result.stdout:
+                        print(f"✅ Output check: found {fragment!r}")
+                    else:
+                        print(f"❌ Output mismatch: {fragment!r} not found")
         else:
             if should_fail:
                 print("✅ EXPECTED FAILURE")
@@ -70,6 +78,27 @@ def run_comprehensive_tests():
     test_error_cases()
     test_edge_cases()
     test_complex_equations()
+    test_limit_cases()
+    test_daemon_mode()
+    test_polish_mode()
+    test_interval_mode()
+    test_precision_escalation()
+    test_classify_mode()
+    test_solve_cache()
+    test_evaluation()
+    test_group_products()
+    test_check_mode()
+    test_thread_safety()
+    test_span_allocations()
+    test_batch_dedupe()
+    test_batch_row_errors()
+    test_result_store()
+    test_batch_metrics()
+    test_checkpoint_resume()
+    test_shard_merge()
+    test_shared_solve()
+    test_linear_systems()
+    test_lazy_startup()
 
 def test_basic_quadratic_cases():
     """Test standard quadratic equations with different discriminant scenarios"""
@@ -436,6 +465,975 @@ def test_complex_equations():
             description="Complex power expressions", 
             expected_degree=2)
 
+def test_limit_cases():
+    """Test that resource limits reject oversized inputs"""
+    print(f"\n{'🟣 RESOURCE LIMITS':=^80}")
+    
+    run_test("2^999999 = x", 
+            should_fail=True, 
+            description="Huge numeric exponent")
+    
+    run_test("(" * 40 + "x" + ")" * 40 + " = 1", 
+            should_fail=True, 
+            description="Parentheses nested too deep")
+    
+    run_test(" + ".join(["x"] * 2000) + " = 0", 
+            should_fail=True, 
+            description="Too many terms")
+    
+    run_test("(x+1)^(9**9**9) = 0", 
+            should_fail=True, 
+            description="Group exponent with ** is rejected before evaluation")
+    
+    run_test("(x+1)^1000 = 0", 
+            should_fail=True, 
+            description="Group power above the maximum degree is rejected before expansion")
+    
+    run_test("(2*x+1)^1000 = 0", 
+            should_fail=True, 
+            description="Scaled group power above the maximum degree")
+    
+    run_test("2^10 = x", 
+            description="Exponent within limits", 
+            expected_degree=1)
+    
+    from equation_parser import parse_equation
+    from errors import ParseError, LimitExceededError
+    for equation, expected in [("10^400 = x", LimitExceededError), ("x^(1/0) = 1", ParseError), 
+                               ("2^(1/0) = x", ParseError), ("0^(-1) = x", ParseError), ("x^4002() = 1", ParseError)]:
+        try:
+            parse_equation(equation)
+            raised = None
+        except Exception as e:
+            raised = type(e)
+        if raised is expected:
+            print(f"✅ {equation} raises {expected.__name__}")
+        else:
+            print(f"❌ {equation} raised {raised.__name__ if raised else 'nothing'}, expected {expected.__name__}")
+
+def test_daemon_mode():
+    """Test that the daemon client prints exactly what computor.py prints"""
+    print(f"\n{'🔌 DAEMON MODE':=^80}")
+    
+    import time
+    import tempfile
+    env = dict(os.environ)
+    env["COMPUTOR_SOCKET"] = os.path.join(tempfile.mkdtemp(), "computor.sock")
+    
+    for started in (False, True):
+        daemon = None
+        if started:
+            daemon = subprocess.Popen([sys.executable, "computor.py", "--daemon", "2"], 
+                                      env=env, stderr=subprocess.DEVNULL)
+            for _ in range(50):
+                if os.path.exists(env["COMPUTOR_SOCKET"]):
+                    break
+                time.sleep(0.1)
+        try:
+            for equation in ["x^2 - 5*x + 6 = 0", "x^2 + 1 = 0", "x^3 = 8", "2^999999 = x"]:
+                direct = subprocess.run([sys.executable, "computor.py", equation], 
+                                        capture_output=True, text=True, timeout=10)
+                client = subprocess.run([sys.executable, "client.py", equation], 
+                                        capture_output=True, text=True, timeout=10, env=env)
+                label = "daemon" if started else "fallback"
+                if (client.stdout, client.returncode) == (direct.stdout, direct.returncode):
+                    print(f"✅ {label}: {equation}")
+                else:
+                    print(f"❌ {label} output differs: {equation}")
+                    print(client.stdout.strip() or client.stderr.strip())
+        finally:
+            if daemon is not None:
+                daemon.terminate()
+                daemon.wait(timeout=10)
+    
+    import socket
+    import threading
+    equation = "x^2 - 5*x + 6 = 0"
+    direct = subprocess.run([sys.executable, "computor.py", equation], capture_output=True, text=True, timeout=10)
+    for label, mode in [("empty reply", 0o600), ("socket open to other users", 0o666)]:
+        path = os.path.join(tempfile.mkdtemp(), "computor.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        os.chmod(path, mode)
+        server.listen(1)
+        server.settimeout(10)
+        
+        def hang_up():
+            try:
+                conn, _ = server.accept()
+                conn.close()
+            except OSError:
+                pass
+        
+        thread = threading.Thread(target=hang_up)
+        thread.start()
+        client = subprocess.run([sys.executable, "client.py", equation], capture_output=True, text=True, 
+                                timeout=10, env=dict(env, COMPUTOR_SOCKET=path))
+        server.close()
+        thread.join()
+        if (client.stdout, client.returncode) == (direct.stdout, direct.returncode):
+            print(f"✅ {label}: client solves in-process")
+        else:
+            print(f"❌ {label}: client output differs")
+            print(client.stdout.strip() or client.stderr.strip())
+    
+    import daemon
+    from daemon_socket import socket_path
+    saved = daemon.RECV_TIMEOUT, dict(os.environ)
+    daemon.RECV_TIMEOUT = 0.2
+    left, right = socket.socketpair()
+    try:
+        daemon.handle(left)
+        print("❌ A silent client holds the worker")
+    except socket.timeout:
+        print("✅ A silent client times out")
+    finally:
+        left.close()
+        right.close()
+        daemon.RECV_TIMEOUT = saved[0]
+    
+    try:
+        os.environ.pop("COMPUTOR_SOCKET", None)
+        os.environ.pop("XDG_RUNTIME_DIR", None)
+        os.environ["TMPDIR"] = tempfile.mkdtemp()
+        directory = os.path.dirname(socket_path(create=True))
+        private = os.stat(directory).st_mode & 0o777 == 0o700
+        os.chmod(directory, 0o755)
+        try:
+            socket_path(create=True)
+            refused = False
+        except PermissionError:
+            refused = True
+        if private and refused:
+            print("✅ Socket directory is private and an open one is refused")
+        else:
+            print(f"❌ Socket directory checks failed (private {private}, refused {refused})")
+    finally:
+        os.environ.clear()
+        os.environ.update(saved[1])
+
+def test_polish_mode():
+    """Test Newton polishing and residual reporting"""
+    print(f"\n{'🎯 ROOT POLISHING':=^80}")
+    
+    run_test("x^2 - 2 = 0", 
+            flags=["--polish"], 
+            description="Irrational roots refined beyond sqrt tolerance", 
+            expected_degree=2, 
+            expected_output=["1.414213562373095 (residual", "-1.414213562373095 (residual"])
+    
+    run_test("x^2 + 2*x + 3 = 0", 
+            flags=["--polish"], 
+            description="Complex roots polished", 
+            expected_degree=2, 
+            expected_output=["-1.0 + 1.414213562373095i (residual"])
+    
+    run_test("3*x - 1 = 0", 
+            flags=["--polish"], 
+            description="Exact linear root needs no iterations", 
+            expected_degree=1, 
+            expected_output=["(residual 0, 0 iterations)"])
+
+def test_precision_escalation():
+    """Test that only ill-conditioned quadratics are re-solved exactly"""
+    print(f"\n{'🔬 PRECISION ESCALATION':=^80}")
+    
+    run_test("x^2 - 0.2*x + 0.01 = 0", 
+            description="Double root hidden by binary rounding", 
+            expected_degree=2, 
+            expected_output=["Discriminant is zero", "0.1"])
+    
+    run_test("x^2 - 2.0000001*x + 1.0000001 = 0", 
+            description="Near-double roots separated exactly", 
+            expected_degree=2, 
+            expected_output=["strictly positive", "1.0000001"])
+    
+    run_test("100000000000*x^2 + 300000000000*x + 200000000000 = 0", 
+            description="Wildly scaled coefficients", 
+            expected_degree=2, 
+            expected_output=["-1.0", "-2.0"])
+    
+    run_test("0.0000001*x^2 + 0.0000001 = 0", 
+            description="Tiny discriminant is negative, not zero", 
+            expected_degree=2, 
+            expected_output=["strictly negative", "0.0 + 1.0i"])
+    
+    from solver import quadratic_precision, solve_precision
+    from equation_parser import parse_equation
+    precisions = [solve_precision(parse_equation(equation)) 
+                  for equation in ("x^2 + 2*x + 1 = 0", "x^2 = 0", "x^2 - 0.2*x + 0.01 = 0")]
+    if precisions == ["float", "float", "exact"]:
+        print("✅ Exact integer discriminants are not escalated")
+    else:
+        print(f"❌ Unexpected precisions: {precisions}")
+    
+    import random
+    generator = random.Random(40)
+    samples = [[generator.uniform(-10, 10) for _ in range(3)] for _ in range(10000)]
+    escalated = sum(1 for a, b, c in samples if quadratic_precision(a, b, c) == "exact")
+    if escalated < len(samples) * 0.01:
+        print(f"✅ Random quadratics rarely escalate ({escalated} of {len(samples)})")
+    else:
+        print(f"❌ Too many escalations: {escalated} of {len(samples)}")
+
+def test_classify_mode():
+    """Test classification by degree and discriminant sign without roots"""
+    print(f"\n{'🏷️ CLASSIFY MODE':=^80}")
+    
+    run_test("x^2 - 0.2*x + 0.01 = 0", 
+            flags=["--classify"], 
+            description="Rounded discriminant classified exactly", 
+            expected_degree=2, 
+            expected_output=["Discriminant sign: zero", "Real solutions: one"])
+    
+    run_test("x^2 + 1 = 0", 
+            flags=["--classify"], 
+            description="Negative discriminant has no real solution", 
+            expected_degree=2, 
+            expected_output=["Discriminant sign: negative", "Real solutions: none"])
+    
+    run_test("2*x = 2*x", 
+            flags=["--classify"], 
+            description="Identity has infinitely many solutions", 
+            expected_degree=0, 
+            expected_output=["Real solutions: infinitely many"])
+    
+    try:
+        import numpy as np
+    except ImportError:
+        print("⏭️ SKIPPED - NumPy is not installed")
+        return
+    
+    from classify import classify, classify_batch
+    from equation_parser import parse_equation
+    equations = ["x^2 - 5*x + 6 = 0", "x^2 - 2*x + 1 = 0", "x^2 + 1 = 0", "3*x = 1", "5 = 5", "5 = 4", 
+                 "x^2 - 0.2*x + 0.01 = 0", "x^2 - 2.0000001*x + 1.0000001 = 0"]
+    matrix = np.array([[0.0, 0, 0]] * len(equations))
+    expected = []
+    for row, equation in enumerate(equations):
+        coeffs = parse_equation(equation)
+        for p, c in coeffs.items():
+            matrix[row, 2 - p] = c
+        expected.append(classify(coeffs))
+    degrees, signs, solutions = classify_batch(matrix)
+    if [(d, s if d == 2 else None, n) for d, s, n in zip(degrees.tolist(), signs.tolist(), solutions.tolist())] == expected:
+        print("✅ Vectorized classification matches the scalar API")
+    else:
+        print(f"❌ Vectorized classification differs: {solutions.tolist()}")
+
+def test_interval_mode():
+    """Test certified root enclosures with interval arithmetic"""
+    print(f"\n{'📏 INTERVAL MODE':=^80}")
+    
+    run_test("x^2 - 4 = 0", 
+            flags=["--intervals"], 
+            description="Exact roots give degenerate enclosures", 
+            expected_degree=2, 
+            expected_output=["certainly positive", "[2.0, 2.0]", "[-2.0, -2.0]"])
+    
+    run_test("x^2 - 2 = 0", 
+            flags=["--intervals"], 
+            description="Irrational roots enclosed by adjacent floats", 
+            expected_degree=2, 
+            expected_output=["[1.414213562373095, 1.4142135623730951]"])
+    
+    run_test("x = 0.1", 
+            flags=["--intervals"], 
+            description="Enclosure contains the decimal root, not only its binary rounding", 
+            expected_degree=1, 
+            expected_output=["[0.09999999999999999, 0.1]"])
+    
+    run_test("x^2 + 2*x + 1 = 0", 
+            flags=["--intervals"], 
+            description="Exactly zero discriminant", 
+            expected_degree=2, 
+            expected_output=["exactly zero", "[-1.0, -1.0]"])
+    
+    run_test("0.1*x^2 + 0.2*x + 0.1 = 0", 
+            flags=["--intervals"], 
+            description="Undecidable discriminant sign is reported", 
+            expected_degree=2, 
+            expected_output=["sign cannot be decided"])
+    
+    run_test("x^2 + 2*x + 3 = 0", 
+            flags=["--intervals"], 
+            description="Complex root enclosures", 
+            expected_degree=2, 
+            expected_output=["certainly negative", "[-1.0, -1.0] + [1.414213562373095, 1.4142135623730951]i"])
+    
+    run_test("-1152921504606847000*x^2 + 4265809567045334000*x - 1" + "0" * 308 + " = 0", 
+            flags=["--intervals"], 
+            description="Overflowing 4ac widens the discriminant instead of crashing", 
+            expected_degree=2, 
+            expected_output=["sign cannot be decided (discriminant lies in [-inf, inf])"])
+
+def test_solve_cache():
+    """Test that equations equal up to scaling share one cached solution"""
+    print(f"\n{'🗃️ SOLVE CACHE':=^80}")
+    
+    from equation_parser import parse_equation
+    from cache import SolveCache
+    
+    cache = SolveCache(maxsize=8)
+    first = cache.solution_lines(parse_equation("2*X^2 - 4 = 0"))
+    second = cache.solution_lines(parse_equation("X^2 = 2"))
+    third = cache.solution_lines(parse_equation("X^2 = 3"))
+    stats = cache.stats()
+    
+    if first == second and first != third:
+        print("✅ Scaled equations share a result")
+    else:
+        print(f"❌ Unexpected cached results: {first} {second} {third}")
+    if (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2):
+        print(f"✅ Hit rate reported: {stats['hit_rate']:.2f}")
+    else:
+        print(f"❌ Unexpected cache stats: {stats}")
+    
+    from solver import solution_lines
+    cache.solution_lines({2: 1.0})
+    small = cache.solution_lines({2: 1000.0, 0: 4e-10})
+    if small == solution_lines({2: 1000.0, 0: 4e-10}) and "strictly negative" in small[0]:
+        print("✅ Small non-zero terms are not quantized away")
+    else:
+        print(f"❌ Small term collapsed onto another key: {small}")
+    
+    cache.solution_lines({2: 1, 1: 2, 0: 1.0000000000001})
+    double = cache.solution_lines({2: 1, 1: 2, 0: 1})
+    if double == solution_lines({2: 1, 1: 2, 0: 1}) and "zero" in double[0]:
+        print("✅ A nearby polynomial solved first does not decide the discriminant sign")
+    else:
+        print(f"❌ Cached result of a nearby polynomial reused: {double}")
+    enclosure = cache.solution_lines({1: 3, 0: -1}, intervals=True)
+    if enclosure == solution_lines({1: 3, 0: -1}, intervals=True) and cache.stats()["bypassed"] >= 2:
+        print("✅ Interval enclosures are solved from the original coefficients")
+    else:
+        print(f"❌ Interval enclosure went through the cache: {enclosure}")
+    
+    for power in range(20):
+        cache.solution_lines({0: -power, 1: 1})
+    if cache.stats()["size"] == 8:
+        print("✅ Cache stays bounded")
+    else:
+        print(f"❌ Cache grew past its bound: {cache.stats()}")
+
+def test_evaluation():
+    """Test vectorized Horner evaluation over NumPy grids"""
+    print(f"\n{'📈 POLYNOMIAL EVALUATION':=^80}")
+    
+    try:
+        import numpy as np
+    except ImportError:
+        print("⏭️ SKIPPED - NumPy is not installed")
+        return
+    
+    from equation_parser import parse_equation
+    from evaluation import coefficient_matrix, evaluate, evaluate_derivative
+    
+    xs = np.linspace(-2, 3, 11)
+    coeffs = parse_equation("x^2 - 3*x + 2 = 0")
+    if np.allclose(evaluate(coeffs, xs), xs**2 - 3*xs + 2):
+        print("✅ Single polynomial on a grid")
+    else:
+        print("❌ Single polynomial values differ")
+    if np.allclose(evaluate_derivative(coeffs, xs), 2*xs - 3):
+        print("✅ Derivative on a grid")
+    else:
+        print("❌ Derivative values differ")
+    
+    matrix = coefficient_matrix([coeffs, parse_equation("2*x = 1"), parse_equation("3 = 1")])
+    expected = np.stack([xs**2 - 3*xs + 2, 2*xs - 1, np.full_like(xs, 2.0)])
+    if matrix.shape == (3, 3) and np.allclose(evaluate(matrix, xs), expected):
+        print("✅ Coefficient matrix against one grid")
+    else:
+        print("❌ Coefficient matrix values differ")
+
+def test_group_products():
+    """Test expansion of products and powers of parenthesized groups"""
+    print(f"\n{'✖️ GROUP PRODUCTS':=^80}")
+    
+    run_test("(x+1)*(x-2) = 0", 
+            description="Product of two groups", 
+            expected_degree=2, 
+            expected_output=["Reduced form: X^2 - X - 2 = 0"])
+    
+    run_test("(x+1)^2 = 0", 
+            description="Square of a group", 
+            expected_degree=2, 
+            expected_output=["Reduced form: X^2 + 2 * X + 1 = 0"])
+    
+    run_test("(x-x+1)^1000 = 2", 
+            description="Degenerate group power gains no spurious high-power terms", 
+            expected_degree=0, 
+            expected_output=["Reduced form:  - 1 = 0", "No solution."])
+    
+    run_test("2*(x+1)*(x-1) = 6", 
+            description="Scalar times product of groups", 
+            expected_degree=2, 
+            expected_output=["Reduced form: 2 * X^2 - 8 = 0"])
+    
+    run_test("x*(x+1) = 2", 
+            description="Variable times a group", 
+            expected_degree=2, 
+            expected_output=["Reduced form: X^2 + X - 2 = 0"])
+    
+    run_test("((x+1)*(x-1))^1 = 3", 
+            description="Nested product inside a power", 
+            expected_degree=2, 
+            expected_output=["Reduced form: X^2 - 4 = 0"])
+    
+    run_test("(x+1)^3 = 0", 
+            should_fail=True, 
+            description="Cube of a group exceeds degree 2")
+    
+    run_test("(x+1)^(-1) = 0", 
+            should_fail=True, 
+            description="Negative power of a group")
+
+def test_check_mode():
+    """Test that --check reports every diagnostic of every equation in one pass"""
+    print(f"\n{'🔎 CHECK MODE':=^80}")
+    
+    import tempfile
+    equations = ["x^2 - 3*x + 2 = 0", 
+                 "x^2 + y = 3@", 
+                 "x^(2+1 = 0", 
+                 "x*x*x = 1/x", 
+                 "(x+1)*(x-2) = 0", 
+                 "x^. = 1", 
+                 "x/2 = 1"]
+    expected = ["2:6: E010", "2:11: E010", "3:2: E012", "4:0: E032", "4:10: E030", "6:2: E013", 
+                "7:0: E050 Invalid term format", "Checked 7 equations: 2 valid, 5 invalid, 7 diagnostics"]
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("\n".join(equations) + "\n")
+    try:
+        result = subprocess.run([sys.executable, "computor.py", "--check", f.name], 
+                                capture_output=True, text=True, timeout=10)
+    finally:
+        os.unlink(f.name)
+    
+    for fragment in expected:
+        if fragment in result.stdout:
+            print(f"✅ Reported {fragment!r}")
+        else:
+            print(f"❌ Missing {fragment!r}")
+    reported_lines = {line.split(":")[0] for line in result.stdout.splitlines()}
+    if result.returncode == 1 and not reported_lines & {"1", "5"}:
+        print("✅ Valid equations are not reported")
+    else:
+        print(f"❌ Unexpected report:\n{result.stdout}")
+    
+    import inspect
+    import re
+    import time
+    from checker import check_equation
+    from equation_parser import parse_equation
+    from errors import ParseError
+    
+    cases = re.findall(r'run_test\("([^"]*)"', inspect.getsource(test_error_cases))
+    cases += ["1/0 = x", "2*(x*x) = 0", "(x^2)^2 = 1", "2^(x) = 1", "(x+1)/2 = 0", 
+              "(x+1)^3 = 0", "(x+1)^(-1) = 0", "2*(3*4) = x", "(2*x)*(x) = 0", "x/2 = 1", 
+              "x^2 + x/4 = 0", "2^(0.5) = x", "(x)(x) = 1", "*2 = x", "x^. = 1", "10^400 = x"]
+    disagreements = []
+    for equation in cases:
+        try:
+            parse_equation(equation)
+            rejected = False
+        except ParseError:
+            rejected = True
+        if bool(check_equation(equation)) != rejected:
+            disagreements.append(equation)
+    if not disagreements:
+        print(f"✅ Checker and parser agree on {len(cases)} equations")
+    else:
+        print(f"❌ Checker and parser disagree on {disagreements}")
+    
+    start = time.perf_counter()
+    codes = [d.code for d in check_equation("x^(9**9**9) = 0")]
+    if "E020" in codes and time.perf_counter() - start < 1:
+        print("✅ '**' in an exponent is reported without being evaluated")
+    else:
+        print(f"❌ Unexpected diagnostics for '**' in an exponent: {codes}")
+
+def test_thread_safety():
+    """Test that the parse and solve core gives the same results from many threads"""
+    print(f"\n{'🧵 THREAD SAFETY':=^80}")
+    
+    from concurrent.futures import ThreadPoolExecutor
+    from equation_parser import parse_equation
+    from solver import solution_lines
+    from errors import ParseError, LimitExceededError
+    
+    equations = ["x^2 - 5*x + 6 = 0", "(x+1)*(x-2) = 3", "x^3 = 8", "2^999999 = x", 
+                 "2*(X+1) = 6", "x^2 + 3@ = 0", "x^2 + 1 = 0"] * 50
+    
+    def outcome(equation):
+        try:
+            return solution_lines(parse_equation(equation))
+        except ParseError as e:
+            return (type(e).__name__, str(e), e.exit_code)
+    
+    sequential = [outcome(e) for e in equations]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        threaded = list(pool.map(outcome, equations))
+    
+    if threaded == sequential:
+        print("✅ Threaded results match sequential results")
+    else:
+        print("❌ Threaded results differ from sequential results")
+    
+    if outcome("2^999999 = x")[0] == LimitExceededError.__name__ and outcome("x^3 = 8")[2] == 1:
+        print("✅ Errors are raised as exceptions instead of exiting")
+    else:
+        print("❌ Unexpected error handling")
+
+def test_span_allocations():
+    """Test that term splitting allocates a flat amount per term, whatever the term length"""
+    print(f"\n{'📐 SPAN ALLOCATIONS':=^80}")
+    
+    import tracemalloc
+    from parser import split_term_spans
+    
+    def peak_per_term(fn, count):
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak / count
+    
+    span_costs = []
+    for count in (50, 200, 800):
+        for length in (5, 100):
+            expression = "+".join(["1" * length + "*x"] * count)
+            spans = peak_per_term(lambda: split_term_spans(expression), count)
+            strings = peak_per_term(lambda: [expression[a:b] for a, b, _ in split_term_spans(expression)], count)
+            span_costs.append(spans)
+            print(f"   {count:>4} terms of length {length:>3}: {spans:6.1f} B/term as spans, {strings:6.1f} B/term as strings")
+            if length == 100 and spans >= strings:
+                print("❌ Spans do not allocate less than term strings")
+    
+    if max(span_costs) < 160:
+        print("✅ Allocations per term stay flat as term count and length grow")
+    else:
+        print(f"❌ Allocations per term grew to {max(span_costs):.1f} bytes")
+
+def test_batch_dedupe():
+    """Test that batch solving dedupes repeated polynomials without changing results"""
+    print(f"\n{'📦 BATCH DEDUPE':=^80}")
+    
+    from equation_parser import parse_equation
+    from solver import solution_lines
+    from batch import solve_batch
+    
+    equations = ["x^2 - 5*x + 6 = 0", "2*x = 4", "x^2 + 1 = 0", "(x+1)^2 = 0", "5 = 5"] * 40
+    coeffs = [parse_equation(e) for e in equations]
+    expected = [solution_lines(c) for c in coeffs]
+    
+    results, report = solve_batch(coeffs)
+    if results == expected and report["deduped"] and report["unique"] == 5:
+        print(f"✅ Deduped {report['rows']} rows to {report['unique']} (ratio {report['dedupe_ratio']:.1f})")
+    else:
+        print(f"❌ Unexpected dedupe results: {report}")
+    
+    distinct = [{1: 1, 0: -k} for k in range(200)]
+    results, report = solve_batch(distinct)
+    if not report["deduped"] and results == [solution_lines(c) for c in distinct]:
+        print("✅ Dedupe skipped when rows are mostly unique")
+    else:
+        print(f"❌ Dedupe should have been skipped: {report}")
+    
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    from evaluation import coefficient_matrix
+    results, report = solve_batch(coefficient_matrix(coeffs))
+    if results == expected and report["unique"] == 5:
+        print("✅ Coefficient matrix deduped with np.unique")
+    else:
+        print("❌ Coefficient matrix results differ")
+
+def test_batch_row_errors():
+    """Test that an exception raised by one row becomes an error row instead of aborting the batch"""
+    print(f"\n{'🧯 BATCH ROW ERRORS':=^80}")
+    
+    import json
+    import tempfile
+    directory = tempfile.mkdtemp()
+    equations = os.path.join(directory, "equations.txt")
+    with open(equations, "w") as f:
+        f.write("x^2 - 5*x + 6 = 0\n10^400 = x\n3*x = 6\n2*x = 4\n")
+    for workers in (1, 2):
+        output = os.path.join(directory, f"rows-{workers}.jsonl")
+        script = f"""
+import batch
+original = batch.parse_equation
+def parse(equation, **kwargs):
+    if equation == "3*x = 6":
+        raise OverflowError("simulated overflow")
+    return original(equation, **kwargs)
+batch.parse_equation = parse
+batch.run_batch({equations!r}, {output!r}, chunk_size=2, workers={workers})
+"""
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+        rows = []
+        if os.path.exists(output):
+            with open(output) as f:
+                rows = [json.loads(line) for line in f]
+        errors = [row.get("error") for row in rows]
+        if (result.returncode == 0 and len(rows) == 4 and errors[0] is None and errors[3] is None 
+                and errors[1].startswith("Limit exceeded") and errors[2] == "OverflowError: simulated overflow"):
+            print(f"✅ {workers} worker(s): failing rows recorded as errors, the batch completes")
+        else:
+            print(f"❌ {workers} worker(s): batch aborted or rows wrong: {errors} {result.stderr.strip()[-200:]}")
+
+def test_result_store():
+    """Test the persistent SQLite result store"""
+    print(f"\n{'💾 RESULT STORE':=^80}")
+    
+    import tempfile
+    import store
+    
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "results.db")
+    
+    db = store.ResultStore(path)
+    db.put_many({"x^2 - 1 = 0": {"degree": 2}, "x = 1": {"error": "boom"}})
+    found = db.get_many(["X^2-1=0", "x=1", "x = 2"])
+    db.close()
+    if found == {"X^2-1=0": {"degree": 2}, "x=1": {"error": "boom"}}:
+        print("✅ Bulk lookup by normalized equation text")
+    else:
+        print(f"❌ Unexpected lookup result: {found}")
+    
+    original = store.SCHEMA_VERSION
+    store.SCHEMA_VERSION = original + 1
+    try:
+        db = store.ResultStore(path)
+        invalidated = db.get_many(["x = 1"]) == {}
+        db.close()
+    finally:
+        store.SCHEMA_VERSION = original
+    print("✅ Schema version change invalidates entries" if invalidated 
+          else "❌ Entries survived a schema version change")
+    
+    db = store.ResultStore(os.path.join(directory, "small.db"), max_bytes=64 * 1024)
+    for chunk in range(20):
+        db.put_many({f"x = {chunk * 100 + k}": {"solution": ["x" * 200]} for k in range(100)})
+    size = db.size_bytes()
+    db.close()
+    print(f"✅ Store evicted down to {size} bytes" if size <= 64 * 1024 
+          else f"❌ Store grew to {size} bytes")
+    
+    equations = os.path.join(directory, "equations.txt")
+    with open(equations, "w") as f:
+        f.write("x^2 - 5*x + 6 = 0\nx^3 = 1\n2*x = 4\nx^2 - 5*x + 6 = 0\n")
+    outputs = []
+    for run in range(2):
+        result = subprocess.run([sys.executable, "computor.py", "--batch", equations, 
+                                 "--store", os.path.join(directory, "batch.db")], 
+                                capture_output=True, text=True, timeout=30)
+        outputs.append(result.stdout)
+    if outputs[0] == outputs[1] and "4 from store" in result.stderr:
+        print("✅ Second batch run served from the store with identical output")
+    else:
+        print(f"❌ Store-backed batch differs: {result.stderr.strip()}")
+
+def test_batch_metrics():
+    """Test latency histograms, progress lines and slowest inputs of batch runs"""
+    print(f"\n{'⏱️ BATCH METRICS':=^80}")
+    
+    import json
+    import tempfile
+    from metrics import LatencyHistogram
+    
+    histogram = LatencyHistogram()
+    for micros in range(1, 1001):
+        histogram.record(micros / 1e6)
+    p50, p99 = histogram.percentile(50), histogram.percentile(99)
+    if abs(p50 - 500) <= 500 * 0.04 and abs(p99 - 990) <= 990 * 0.04 and histogram.max == 1000:
+        print(f"✅ Histogram percentiles within 4% (p50 {p50}us, p99 {p99}us)")
+    else:
+        print(f"❌ Histogram percentiles off: p50 {p50}us, p99 {p99}us")
+    
+    directory = tempfile.mkdtemp()
+    equations = os.path.join(directory, "equations.txt")
+    metrics_path = os.path.join(directory, "metrics.json")
+    with open(equations, "w") as f:
+        f.write("x^2 - 5*x + 6 = 0\nx^3 = 1\n2*x = 4\n(x+1)*(x-2) = 0\n7 = 7\n" * 20)
+    result = subprocess.run([sys.executable, "computor.py", "--batch", equations, os.devnull, 
+                             "--progress", "0", "--metrics", metrics_path], 
+                            capture_output=True, text=True, timeout=30)
+    with open(metrics_path) as f:
+        metrics = json.load(f)
+    
+    if "[progress] 100 equations" in result.stderr and "20 errors" in result.stderr:
+        print("✅ Progress reports rate, errors and ETA on stderr")
+    else:
+        print(f"❌ Missing progress line: {result.stderr.strip()}")
+    stages = set(metrics["stages"])
+    if {"parse", "expand_products", "expand_distributive", "reduce", "solve"} <= stages:
+        print("✅ Per-stage histograms written")
+    else:
+        print(f"❌ Missing stage histograms: {sorted(stages)}")
+    degrees = {name: h["count"] for name, h in metrics["degrees"].items()}
+    if degrees == {"degree 0": 20, "degree 1": 20, "degree 2": 40, "error": 20}:
+        print("✅ Per-degree histograms written")
+    else:
+        print(f"❌ Unexpected degree histograms: {degrees}")
+    if metrics["slowest"] and metrics["slowest"][0]["seconds"] >= metrics["slowest"][-1]["seconds"]:
+        print("✅ Slowest inputs captured with timings")
+    else:
+        print("❌ Slowest inputs missing")
+    
+    with open(equations, "w") as f:
+        f.write("x^2 - 5*x + 6 = 0\n2*x = 4\n" * 1500)
+    result = subprocess.run([sys.executable, "computor.py", "--batch", equations, os.devnull, "--progress", "0"], 
+                            capture_output=True, text=True, timeout=30)
+    counts = [int(line.split()[1]) for line in result.stderr.splitlines() if line.startswith("[progress]")]
+    if counts[:3] == [500, 1000, 1500] and counts[-1] == 3000:
+        print("✅ Progress is reported from inside a chunk")
+    else:
+        print(f"❌ Unexpected progress counts within one chunk: {counts}")
+
+def test_checkpoint_resume():
+    """Test that an interrupted batch resumes without duplicated or missing rows"""
+    print(f"\n{'♻️ CHECKPOINT AND RESUME':=^80}")
+    
+    import tempfile
+    directory = tempfile.mkdtemp()
+    equations = os.path.join(directory, "equations.txt")
+    expected = os.path.join(directory, "expected.jsonl")
+    output = os.path.join(directory, "output.jsonl")
+    with open(equations, "w") as f:
+        for k in range(60):
+            f.write(f"x^2 - {k}*x + 1 = 0\n" if k % 7 else "x^3 = 1\n\n")
+    
+    subprocess.run([sys.executable, "computor.py", "--batch", equations, expected], 
+                   capture_output=True, timeout=30)
+    
+    def crash(at, interval):
+        script = f"""
+import batch
+calls = []
+original = batch.process_chunk
+def failing(*args, **kwargs):
+    calls.append(1)
+    if len(calls) == {at}:
+        raise RuntimeError("simulated crash")
+    return original(*args, **kwargs)
+batch.process_chunk = failing
+try:
+    batch.run_batch({equations!r}, {output!r}, chunk_size=7, checkpoint_interval={interval})
+except RuntimeError:
+    pass
+with open({output!r}, "a") as f:
+    f.write('{{"line": 99, "equ')
+"""
+        subprocess.run([sys.executable, "-c", script], capture_output=True, timeout=30)
+    
+    def resume():
+        return subprocess.run([sys.executable, "computor.py", "--batch", equations, output, 
+                               "--resume", "--workers", "2"], 
+                              capture_output=True, text=True, timeout=60)
+    
+    with open(expected) as f:
+        expected_rows = f.read()
+    
+    crash(4, 0)
+    result = resume()
+    with open(output) as f:
+        resumed_rows = f.read()
+    if "Resuming after line" in result.stderr and resumed_rows == expected_rows:
+        print("✅ Resumed output matches an uninterrupted run")
+    else:
+        print(f"❌ Resumed output differs: {result.stderr.strip()}")
+    
+    crash(2, 1000)
+    result = resume()
+    with open(output) as f:
+        resumed_rows = f.read()
+    if "Resuming after line" not in result.stderr and resumed_rows == expected_rows:
+        print("✅ A fresh run discards the previous run's checkpoint")
+    else:
+        print(f"❌ Stale checkpoint was resumed: {result.stderr.strip()}")
+    
+    crash(4, 0)
+    with open(equations, "a") as f:
+        f.write("x = 1\n")
+    result = resume()
+    if result.returncode == 1 and "changed since the checkpoint" in result.stderr:
+        print("✅ Resuming against a modified input is refused")
+    else:
+        print(f"❌ Modified input was resumed: {result.stderr.strip()}")
+
+def test_shard_merge():
+    """Test that sharded batch runs merge back into a single-run result"""
+    print(f"\n{'🧩 SHARD AND MERGE':=^80}")
+    
+    import tempfile
+    from shard import shard_of
+    directory = tempfile.mkdtemp()
+    equations = os.path.join(directory, "equations.txt")
+    expected = os.path.join(directory, "expected.jsonl")
+    merged = os.path.join(directory, "merged.jsonl")
+    with open(equations, "w") as f:
+        for k in range(50):
+            f.write(f"x^2 - {k % 9}*x + 1 = 0\n")
+            f.write(f"X^2-{k % 9}*X+1=0\n\n" if k % 3 else "2 * x = 4 = 1\n")
+    
+    if shard_of("x^2 - 3*x + 1 = 0", 4) == shard_of("X^2-3*X+1=0", 4):
+        print("✅ Equivalent spellings share a shard")
+    else:
+        print("❌ Equivalent spellings split across shards")
+    
+    subprocess.run([sys.executable, "computor.py", "--batch", equations, expected], 
+                   capture_output=True, timeout=30)
+    subprocess.run([sys.executable, "computor.py", "--shard", equations, "3", directory], 
+                   capture_output=True, timeout=30)
+    nodes = []
+    results = []
+    for k in range(3):
+        results.append(os.path.join(directory, f"result-{k}.jsonl"))
+        nodes.append(subprocess.Popen([sys.executable, "computor.py", "--batch", 
+                                       os.path.join(directory, f"shard-{k:05d}-of-00003.txt"), results[-1]], 
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    for node in nodes:
+        node.wait(timeout=30)
+    result = subprocess.run([sys.executable, "computor.py", "--merge", equations, merged] + results, 
+                            capture_output=True, text=True, timeout=30)
+    
+    with open(expected) as f:
+        expected_rows = f.read()
+    with open(merged) as f:
+        merged_rows = f.read()
+    if result.returncode == 0 and merged_rows == expected_rows:
+        print("✅ Merged shard results match a single batch run")
+    else:
+        print(f"❌ Merged output differs: {result.stderr.strip()}")
+    
+    result = subprocess.run([sys.executable, "computor.py", "--merge", equations, merged] + results[:2], 
+                            capture_output=True, text=True, timeout=30)
+    if result.returncode == 1 and "Error:" in result.stderr:
+        print("✅ Merging with the wrong shard count is rejected")
+    else:
+        print("❌ Mismatched shard results were merged")
+
+def test_shared_solve():
+    """Test the shared-memory parallel solve against the single-process kernel"""
+    print(f"\n{'🧠 SHARED-MEMORY SOLVE':=^80}")
+    
+    try:
+        import numpy as np
+    except ImportError:
+        print("⏭️ SKIPPED - NumPy is not installed")
+        return
+    
+    from shared_solve import solve_block, solve_pickled, solve_shared
+    
+    roots = solve_shared(np.array([[1, -5, 6], [1, 2, 5], [0, 2, -4]]), workers=2)
+    if np.allclose(roots, [[3, 2], [-1 + 2j, -1 - 2j], [2, 2]]):
+        print("✅ Real, complex and linear rows solved in solver order")
+    else:
+        print(f"❌ Unexpected roots: {roots.tolist()}")
+    
+    coefficients = np.random.default_rng(42).uniform(-10, 10, (200000, 3))
+    expected = solve_block(coefficients, np.empty((len(coefficients), 2), dtype=complex))
+    shared = solve_shared(coefficients, workers=3)
+    pickled = solve_pickled(coefficients, workers=3)
+    if np.array_equal(shared, expected) and np.array_equal(pickled, expected):
+        print("✅ Shared-memory and pickling pools match a single process")
+    else:
+        print("❌ Parallel roots differ from a single process")
+    
+    if os.path.isdir("/dev/shm"):
+        from multiprocessing import Pool
+        before = set(os.listdir("/dev/shm"))
+        with Pool(2) as pool:
+            for _ in range(3):
+                solve_shared(coefficients, workers=2, pool=pool)
+        if np.array_equal(solve_shared(coefficients, workers=2), expected) and set(os.listdir("/dev/shm")) <= before:
+            print("✅ Reused pools leave the blocks intact until the creator unlinks them")
+        else:
+            print("❌ Shared blocks were lost or leaked")
+
+def test_linear_systems():
+    """Test sparse systems of linear equations in named variables"""
+    print(f"\n{'🕸️ LINEAR SYSTEMS':=^80}")
+    
+    try:
+        import scipy.sparse
+    except ImportError:
+        print("⏭️ SKIPPED - SciPy is not installed")
+        return
+    import tempfile
+    directory = tempfile.mkdtemp()
+    cases = [
+        ("Unique solution", "2x + 3*y = 8\nx - y = -1\n", 0, ["rank 2", "x = 1.0", "y = 2.0"]),
+        ("Rank deficient system", "x + y = 2\n2*x + 2*y = 4\n", 0, ["rank 1", "infinitely many solutions"]),
+        ("Inconsistent system", "x + y = 2\nx + y = 3\n", 0, ["Inconsistent system"]),
+        ("Invalid term", "a + b = 1\na + * b = 2\n", 1, ["Error: equation 2: Invalid term"]),
+    ]
+    for description, text, expected_code, expected_output in cases:
+        path = os.path.join(directory, "system.txt")
+        with open(path, "w") as f:
+            f.write(text)
+        result = subprocess.run([sys.executable, "computor.py", "--system", path], 
+                                capture_output=True, text=True, timeout=30)
+        missing = [expected for expected in expected_output if expected not in result.stdout]
+        if result.returncode == expected_code and not missing:
+            print(f"✅ {description}")
+        else:
+            print(f"❌ {description}: {result.stdout.strip()}")
+    
+    from linear_system import estimate_rank, parse_system, solve_system
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import structural_rank
+    n = 100000
+    chain = [f"2*v{i} - v{i + 1} = 1" for i in range(n - 1)]
+    matrix, rhs, names = parse_system(chain + [f"v{n - 1} = 1"])
+    result = solve_system(matrix, rhs)
+    if matrix.nnz == 2 * n - 1 and result.status == "unique" and result.residual < 1e-8:
+        print(f"✅ {n}-variable sparse system solved (residual {result.residual:.2g})")
+    else:
+        print(f"❌ Sparse system not solved: {result.status}, residual {result.residual}")
+    
+    for description, equations, expected_rank, expected_status in [
+            ("Over-determined", chain + [f"v{n - 1} = 1"] + chain[:10], n, "unique"), 
+            ("Dependent equations", chain + chain[:10], n - 1, "underdetermined")]:
+        matrix, rhs, names = parse_system(equations)
+        result = solve_system(matrix, rhs)
+        if (result.rank, result.status) == (expected_rank, expected_status) and result.residual < 1e-8:
+            print(f"✅ {description} {matrix.shape[0]}x{matrix.shape[1]} system: numerical rank {result.rank} "
+                  f"(structural rank {structural_rank(matrix)})")
+        else:
+            print(f"❌ {description} system: rank {result.rank}, {result.status}")
+    
+    wide = csr_matrix(([1.0] * 6, [0, 1, 2, 3, 4, 4], [0, 1, 2, 3, 4, 5, 6]), shape=(6, 400000))
+    if estimate_rank(wide)[0] == 5:
+        print("✅ Wide systems are ranked without a dense copy")
+    else:
+        print(f"❌ Wide system rank: {estimate_rank(wide)[0]}")
+
+def test_lazy_startup():
+    """Test that a single equation does not import modules of other modes"""
+    print(f"\n{'🚀 LAZY STARTUP':=^80}")
+    
+    from bench_startup import HEAVY_MODULES, bench_env, import_times
+    imported = {name.split(".")[0] for name, _, _ in import_times(bench_env())}
+    heavy = sorted(imported & HEAVY_MODULES)
+    if "equation_parser" in imported and not heavy:
+        print("✅ Single equation imports only the parser and solver")
+    else:
+        print(f"❌ Single equation imports {', '.join(heavy) or 'nothing'}")
+    
+    import parser
+    pattern = parser.LazyPattern(r'[Xx]')
+    if pattern.compiled is None and pattern.search("2*x") and pattern.compiled is not None:
+        print("✅ Patterns are compiled on first use")
+    else:
+        print("❌ Lazy pattern compiled eagerly or not at all")
+
 def main():
     print("🧪 COMPREHENSIVE TEST SUITE FOR QUADRATIC EQUATION SOLVER")
     print("=" * 80)